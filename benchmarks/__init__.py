@@ -0,0 +1,41 @@
+"""
+Benchmarks
+
+Throughput and allocation benchmarks for the game's hot paths. Most of
+them need a configured database, so run them from `evennia shell`:
+
+    >>> from benchmarks import character_creation
+    >>> character_creation.run()
+
+Each module exposes `run(**kwargs)`, which prints a short report and
+cleans up whatever it created.
+
+"""
+import time
+
+
+def timed(func, *args, **kwargs):
+    """
+    Call `func` once and time it.
+
+    Returns:
+        result (tuple): `(seconds, return value of func)`.
+    """
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def report(title, rows):
+    """
+    Print a benchmark report.
+
+    Args:
+        title (str): Report heading.
+        rows (list): `(label, count, seconds)` tuples.
+    """
+    print(title)
+    for label, count, seconds in rows:
+        rate = count / seconds if seconds else float("inf")
+        print("  {0:<32} {1:>8} in {2:8.3f}s  ({3:10.1f}/s)".format(
+            label, count, seconds, rate))
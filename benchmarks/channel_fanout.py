@@ -0,0 +1,54 @@
+"""
+Compares rendering a channel message for each of `subscribers` sessions,
+as happens when every session parses the markup itself, with
+`utils.format.send_styled_many`, which `Channel.distribute_message` uses
+to render once per client capability.
+
+Creating thousands of connected Players is not practical from a shell,
+so the subscribers are stand-in sessions with a mix of telnet and
+webclient capabilities that discard what they are sent.
+
+"""
+from benchmarks import report, timed
+from utils.format import StyledText, _render, get_render_mode, \
+    send_styled_many
+
+_MESSAGE = "[|cPublic|n] |wAnn|n says, \"|gShip |Yoff|n the |rstarboard|n " \
+           "bow, closing fast!\""
+
+_CLIENTS = (
+    ("telnet", {"ANSI": True}),
+    ("telnet", {"ANSI": True, "XTERM256": True}),
+    ("telnet", {"NOCOLOR": True}),
+    ("webclient/websocket", {}),
+)
+
+
+class _BenchSession(object):
+    def __init__(self, protocol_key, protocol_flags):
+        self.protocol_key = protocol_key
+        self.protocol_flags = protocol_flags
+
+    def msg(self, text=None, **kwargs):
+        pass
+
+
+def run(subscribers=5000, posts=20):
+    sessions = [_BenchSession(*_CLIENTS[i % len(_CLIENTS)])
+                for i in range(subscribers)]
+    messages = ["{0} ({1})".format(_MESSAGE, i) for i in range(posts)]
+
+    def _per_session():
+        for message in messages:
+            for session in sessions:
+                session.msg(_render(message, get_render_mode(session)))
+
+    def _per_mode():
+        for message in messages:
+            send_styled_many(sessions, StyledText(message), from_channel=1)
+
+    sends = subscribers * posts
+    report("Channel fan-out ({0} subscribers)".format(subscribers), [
+        ("render per session", sends, timed(_per_session)[0]),
+        ("render per client capability", sends, timed(_per_mode)[0]),
+    ])
@@ -0,0 +1,35 @@
+"""
+Compares `utils.characters.create_characters` against creating the same
+characters one at a time through `create_character`, the path used by
+the login menu.
+
+"""
+from evennia.utils import create
+
+from benchmarks import report, timed
+from utils.characters import create_character, create_characters
+
+
+def run(count=500):
+    player = create.create_player("benchcreator", "bench@example.com",
+                                  "benchpassword")
+    characters = []
+    try:
+        seconds_single, created = timed(
+            lambda: [create_character(player, "bench_single_{0}".format(i))
+                     for i in range(count)])
+        characters.extend(created)
+
+        seconds_batch, created = timed(
+            create_characters,
+            [(player, "bench_batch_{0}".format(i)) for i in range(count)])
+        characters.extend(created)
+    finally:
+        for character in characters:
+            character.delete()
+        player.delete()
+
+    report("Character creation", [
+        ("create_character (per call)", count, seconds_single),
+        ("create_characters (batch)", count, seconds_batch),
+    ])
@@ -0,0 +1,43 @@
+"""
+Compares parse throughput of `server.conf.cmdparser.cmdparser` with
+Evennia's stock parser, on the merged CharacterCmdSet and PlayerCmdSet.
+
+Run from `evennia shell`; `caller` defaults to object #1 (the superuser's
+character) since the parsers check command access on it.
+
+"""
+from evennia.commands.cmdparser import cmdparser as stock_cmdparser
+from evennia.objects.models import ObjectDB
+
+from benchmarks import report, timed
+from commands.default_cmdsets import CharacterCmdSet, PlayerCmdSet
+from server.conf.cmdparser import cmdparser, install
+
+_INPUTS = ("look", "l here", "say hello there", "@ooc", "engineer",
+           "sensors 500", "get ball", "2-look", "nosuchcommand foo",
+           "@prototypes reload")
+
+
+def run(lines=20000, caller=None):
+    install()
+    caller = caller or ObjectDB.objects.get_id(1)
+    cmdset = CharacterCmdSet() + PlayerCmdSet()
+    inputs = [_INPUTS[i % len(_INPUTS)] for i in range(lines)]
+
+    for raw_string in _INPUTS:
+        stock = [match[:2] + match[3:5]
+                 for match in stock_cmdparser(raw_string, cmdset, caller)]
+        ours = [match[:2] + match[3:5]
+                for match in cmdparser(raw_string, cmdset, caller)]
+        if stock != ours:
+            print("Mismatch for {0!r}: {1} != {2}".format(raw_string, stock,
+                                                          ours))
+
+    report("Command parsing ({0} commands)".format(len(cmdset.commands)), [
+        ("stock cmdparser", lines,
+         timed(lambda: [stock_cmdparser(raw_string, cmdset, caller)
+                        for raw_string in inputs])[0]),
+        ("trie cmdparser", lines,
+         timed(lambda: [cmdparser(raw_string, cmdset, caller)
+                        for raw_string in inputs])[0]),
+    ])
@@ -0,0 +1,67 @@
+"""
+Compares announcing a burst of logins one channel message at a time
+with coalescing them through `typeclasses.channels.ConnectAnnouncer`, on
+a temporary channel with `listeners` subscribed players.
+
+Each listener is given a stand-in telnet session that counts what it is
+sent, so the report shows the sends each listener actually received.
+
+"""
+from evennia.utils import create
+
+from benchmarks import report, timed
+from typeclasses.channels import ConnectAnnouncer
+
+
+class _CountingSession(object):
+    protocol_key = "telnet"
+
+    def __init__(self):
+        self.protocol_flags = {"ANSI": True}
+        self.sends = 0
+
+    def msg(self, text=None, **kwargs):
+        self.sends += 1
+
+
+def run(logins=500, listeners=50):
+    channel = create.create_channel("bench_connect",
+                                    locks="listen:all();send:all()")
+    players = [create.create_player("benchlistener{0}".format(i),
+                                    "bench{0}@example.com".format(i),
+                                    "benchpassword")
+               for i in range(listeners)]
+    sessions = [_CountingSession() for _ in players]
+    try:
+        for player, session in zip(players, sessions):
+            channel.connect(player)
+            # Stands in for the connected sessions the channel sends to.
+            player.sessions.all = lambda session=session: [session]
+        messages = ["|Gbench_login_{0} connected|n".format(i)
+                    for i in range(logins)]
+
+        seconds_single = timed(
+            lambda: [channel.tempmsg(message) for message in messages])[0]
+        sends_single = sessions[0].sends
+
+        announcer = ConnectAnnouncer(channel)
+        announcer.window = 3600
+
+        def _burst():
+            for num, message in enumerate(messages):
+                announcer.announce(message, "bench_login_{0}".format(num))
+            announcer.flush()
+
+        seconds_batched = timed(_burst)[0]
+        sends_batched = sessions[0].sends - sends_single
+    finally:
+        for player in players:
+            player.delete()
+        channel.delete()
+
+    report("Connect announcements ({0} listeners)".format(listeners), [
+        ("one message per login", logins, seconds_single),
+        ("coalesced", logins, seconds_batched),
+    ])
+    print("  sends per listener: {0} -> {1}".format(sends_single,
+                                                    sends_batched))
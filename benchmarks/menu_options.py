@@ -0,0 +1,109 @@
+"""
+Counts the allocations made building menu options per render, comparing
+the option templates in `utils.menu` with the previous approach of
+building fresh tuples, dicts and lambdas on every render.
+
+This one needs no database and can also be run directly:
+
+    python -m benchmarks.menu_options
+
+"""
+import gc
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc; fall back to counting tracked objects.
+    tracemalloc = None
+
+from benchmarks import report, timed
+from utils.menu import PAGE_SIZE, get_paged_options, get_user_yesno
+
+
+class _Namespace(object):
+    pass
+
+
+class _Item(object):
+    def __init__(self, key):
+        self.key = key
+
+
+def _make_caller():
+    caller = _Namespace()
+    caller.ndb = _Namespace()
+    caller.ndb._menutree = _Namespace()
+    return caller
+
+
+def _noop(caller):
+    pass
+
+
+def _legacy_yesno(yes_goto, no_goto, yes_exec=None, no_exec=None):
+    return ({"key": ('y', 'yes',), "goto": yes_goto, "exec": yes_exec},
+            {"key": ('n', 'no',), "goto": no_goto, "exec": no_exec},)
+
+
+def _legacy_list(caller, items):
+    options = ()
+    for item in items:
+        options += ({"desc": item.key,
+                     "goto": "start",
+                     "exec": (lambda character:
+                              lambda caller: _noop(caller))(item)},)
+    options += ({"desc": "Back", "goto": "start"},)
+    return options
+
+
+def _legacy_render(caller, items):
+    return _legacy_yesno("yes", "no", _noop, _noop), \
+        _legacy_list(caller, items)
+
+
+def _template_render(caller, items):
+    return get_user_yesno("yes", "no", _noop, _noop), \
+        get_paged_options(caller, "bench", items, lambda item: item.key,
+                          "start", lambda caller, item: None,
+                          "list", "start")
+
+
+def _count_allocations(render, caller, items, renders):
+    render(caller, items)
+    gc.collect()
+    if tracemalloc:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [render(caller, items) for _ in range(renders)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        before = len(gc.get_objects())
+        kept = [render(caller, items) for _ in range(renders)]
+        after = len(gc.get_objects())
+    del kept
+    return (after - before) // renders
+
+
+def run(num_items=PAGE_SIZE, renders=1000):
+    items = [_Item("character{0}".format(i)) for i in range(num_items)]
+    caller = _make_caller()
+
+    unit = "bytes" if tracemalloc else "objects"
+    for label, render in (("legacy", _legacy_render),
+                          ("templates", _template_render)):
+        print("{0:<10} {1:>8} {2} retained per render".format(
+            label, _count_allocations(render, caller, items, renders), unit))
+
+    report("Menu option renders ({0} items)".format(num_items), [
+        ("legacy", renders,
+         timed(lambda: [_legacy_render(caller, items)
+                        for _ in range(renders)])[0]),
+        ("templates", renders,
+         timed(lambda: [_template_render(caller, items)
+                        for _ in range(renders)])[0]),
+    ])
+
+
+if __name__ == "__main__":
+    run()
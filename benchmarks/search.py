@@ -0,0 +1,51 @@
+"""
+Compares the indexed exact `search` of
+`typeclasses.objects.IndexedSearchMixin` with Evennia's exact search over
+the same candidates, in a room crowded with objects, and the cost of
+resolving `2-name` after an ambiguous search.
+
+"""
+from evennia.objects.models import ObjectDB
+from evennia.utils import create
+
+from benchmarks import report, timed
+
+
+def run(count=2000, searches=2000):
+    room = create.create_object("typeclasses.rooms.Room", key="bench_room")
+    searcher = create.create_object("typeclasses.objects.Object",
+                                    key="bench_searcher", location=room)
+    objs = [create.create_object("typeclasses.objects.Object",
+                                 key="bench_item_{0}".format(i % (count // 2)),
+                                 location=room)
+            for i in range(count)]
+    try:
+        names = ["bench_item_{0}".format(i % (count // 2))
+                 for i in range(searches)]
+        candidates = searcher.contents + [room] + room.contents
+
+        seconds_stock = timed(
+            lambda: [ObjectDB.objects.object_search(name,
+                                                    candidates=candidates,
+                                                    exact=True)
+                     for name in names])[0]
+        seconds_indexed = timed(
+            lambda: [searcher.search(name, quiet=True, exact=True)
+                     for name in names])[0]
+
+        searcher.search(names[0], exact=True)
+        seconds_multimatch = timed(
+            lambda: [searcher.search("2-" + names[0], quiet=True,
+                                     exact=True)
+                     for _ in range(searches)])[0]
+    finally:
+        for obj in objs:
+            obj.delete()
+        searcher.delete()
+        room.delete()
+
+    report("Search in a room of {0} objects".format(count), [
+        ("stock object_search", searches, seconds_stock),
+        ("indexed search", searches, seconds_indexed),
+        ("2-name from previous matches", searches, seconds_multimatch),
+    ])
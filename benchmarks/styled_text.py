@@ -0,0 +1,31 @@
+"""
+Compares sending colour markup as a string, which Evennia parses with
+`parse_ansi` on every message, with `utils.format.StyledText`, which
+parses once per client capability.
+
+Needs Evennia importable but no database.
+
+"""
+from evennia.utils.ansi import parse_ansi
+
+from benchmarks import report, timed
+from utils.format import RENDER_XTERM256, format_invalid, format_valid, \
+    styled
+
+_MARKUP = "Account: {0}  |  Character: {1}  |  Slots: {2}".format(
+    format_valid("bencher"), format_invalid("Unavailable"),
+    format_valid("(3/5)"))
+
+
+def run(messages=10000):
+    seconds_string, _ = timed(
+        lambda: [parse_ansi(_MARKUP + "|n", xterm256=True)
+                 for _ in range(messages)])
+    seconds_styled, _ = timed(
+        lambda: [styled(_MARKUP).render(RENDER_XTERM256)
+                 for _ in range(messages)])
+
+    report("Colour markup rendering", [
+        ("parse_ansi per message", messages, seconds_string),
+        ("StyledText (cached)", messages, seconds_styled),
+    ])
@@ -0,0 +1,98 @@
+from commands.command import Command
+from typeclasses.scripts import get_movement_script
+from utils.lazy import IMPORT_TIMER
+from utils.prototypes import PROTOTYPES
+
+
+class CmdPrototypes(Command):
+    """
+    list or reload prototypes
+
+    Usage:
+      @prototypes
+      @prototypes reload
+
+    Lists the prototypes in world.prototypes. With "reload", re-imports
+    the module and re-resolves only the prototypes that changed.
+    """
+    key = "@prototypes"
+    locks = "cmd:perm(Builders)"
+    help_category = "Building"
+
+    def func(self):
+        if self.args.strip() == "reload":
+            changed = PROTOTYPES.reload()
+            self.caller.msg("Reloaded prototypes. Changed: {0}".format(
+                ", ".join(changed) or "none"))
+        else:
+            self.caller.msg("Prototypes: {0}".format(
+                ", ".join(PROTOTYPES.names())))
+
+
+class CmdImportProfile(Command):
+    """
+    show the slowest game module imports
+
+    Usage:
+      @importprofile [<count>]
+
+    Lists the game directory modules that took longest to import since
+    import timing was switched on (see IMPORT_PROFILE in the settings),
+    including modules only imported on first use.
+    Self time leaves out other game modules imported along the way.
+    """
+    key = "@importprofile"
+    locks = "cmd:perm(Wizards)"
+    help_category = "System"
+
+    def func(self):
+        args = self.args.strip()
+        count = int(args) if args.isdigit() else 15
+
+        if not IMPORT_TIMER.installed:
+            self.msg("Import timing is off; set IMPORT_PROFILE = True in "
+                     "the settings and reload.")
+            return
+
+        slowest = IMPORT_TIMER.get_slowest(count)
+        if not slowest:
+            self.msg("No game module imports were timed.")
+            return
+
+        lines = ["{0:<48} {1:>10} {2:>10}".format("Module", "Total (ms)",
+                                                  "Self (ms)")]
+        lines.extend("{0:<48} {1:>10.1f} {2:>10.1f}".format(
+            name, total * 1000, own * 1000) for name, total, own in slowest)
+        self.msg("\n".join(lines))
+
+
+class CmdMovementStats(Command):
+    """
+    show construct movement statistics
+
+    Usage:
+      @movement
+
+    Shows how many constructs are moving and how long the movement
+    script's ticks take.
+    """
+    key = "@movement"
+    locks = "cmd:perm(Wizards)"
+    help_category = "System"
+
+    def func(self):
+        script = get_movement_script(create=False)
+        if not script:
+            self.msg("The construct movement script is not running.")
+            return
+
+        metrics = script.get_metrics()
+        self.msg("\n".join([
+            "Moving constructs: {0}".format(metrics["moving"]),
+            "Ticks: {0}".format(metrics["ticks"]),
+            "Last tick: {0:.3f} ms".format(metrics["last_tick_time"] * 1000),
+            "Average tick: {0:.3f} ms".format(
+                metrics["average_tick_time"] * 1000),
+            "Slowest tick: {0:.3f} ms".format(
+                metrics["max_tick_time"] * 1000),
+        ]))
@@ -5,8 +5,14 @@ Commands describe the input the player can do to the game.
 
 """
 
+from django.conf import settings
+
 from evennia import Command as BaseCommand
-from evennia.utils.evmenu import EvMenu
+from evennia import default_cmds
+
+from utils.account import invalidate_account_snapshot, open_account_menu
+from utils.character_names import CHARACTER_NAMES
+from utils.characters import create_character
 
 
 class Command(BaseCommand):
@@ -211,14 +217,9 @@ class CmdOOCLook(Command):
 
 
     def func(self):
-        EvMenu(
-            self.session,
-            startnode="option_start",
-            menudata="menus.player_login",
-            session=self.session,
-            # TODO: Delete eventually, left here for ease of debugging
-            cmd_on_exit=None,
-        )
+        # TODO: Delete cmd_on_exit eventually, left here for ease of
+        # debugging
+        open_account_menu(self.session, cmd_on_exit=None)
 
 class CmdOOC(Command):
 
@@ -235,17 +236,104 @@ class CmdOOC(Command):
 
         current_character = player.get_puppet(session)
         player.db._last_puppet = current_character
+        invalidate_account_snapshot(player)
 
         try:
             player.unpuppet_object(session)
-
-            EvMenu(
-                self.session,
-                startnode="option_start",
-                menudata="menus.player_login",
-                session=self.session,
-            )
+            open_account_menu(session)
         except RuntimeError as ex:
             self.msg("|rUnable to return to account menu:{0}".format(ex))
 
 
+class CmdCharCreate(default_cmds.CmdCharCreate):
+    """
+    create a new character
+
+    Usage:
+      @charcreate <charname> [= desc]
+
+    Create a new character, optionally giving it a description. You
+    may use upper-case letters in the name - you will nevertheless
+    always be able to access your character using lower-case letters
+    if you want.
+    """
+
+    # Evennia's version counts and appends to the old
+    # _playable_characters list; this one uses player.characters.
+
+    def func(self):
+        player = self.player
+        if not self.args:
+            self.msg("Usage: @charcreate <charname> [= description]")
+            return
+
+        key = self.lhs
+        desc = self.rhs
+        charmax = settings.MAX_NR_CHARACTERS \
+            if settings.MULTISESSION_MODE > 1 else 1
+        if not player.is_superuser and player.characters.count() >= charmax:
+            self.msg("You may only create a maximum of {0} "
+                     "characters.".format(charmax))
+            return
+        if CHARACTER_NAMES.is_taken(key):
+            self.msg("{0} is already taken.".format(key))
+            return
+
+        new_character = create_character(player, key)
+        if desc:
+            new_character.db.desc = desc
+        elif not new_character.db.desc:
+            new_character.db.desc = "This is a Player."
+        self.msg("Created new character {0}. Use |w@ic {0}|n to enter the "
+                 "game as this character.".format(new_character.key))
+
+
+class CmdCharDelete(default_cmds.CmdCharDelete):
+    """
+    delete a character - this cannot be undone!
+
+    Usage:
+      @chardelete <charname>
+
+    Permanently deletes one of your characters.
+    """
+
+    # Evennia's version searches and rewrites the old
+    # _playable_characters list; this one uses player.characters, which
+    # the deleted character leaves by itself.
+
+    def func(self):
+        player = self.player
+        if not self.args:
+            self.msg("Usage: @chardelete <charactername>")
+            return
+
+        name = self.args.strip().lower()
+        match = [character for character in player.characters.all()
+                 if character.key.lower() == name]
+        if not match:
+            self.msg("You have no such character to delete.")
+            return
+        elif len(match) > 1:
+            self.msg("Aborting - there are two characters with the same "
+                     "name. Ask an admin to delete the right one.")
+            return
+
+        # Imported here so that EvMenu is only loaded once it is needed.
+        from evennia.utils.evmenu import get_input
+
+        def _callback(caller, prompt, result):
+            character = caller.ndb._char_to_delete
+            del caller.ndb._char_to_delete
+            if result.lower() == "yes" and character.pk:
+                key = character.key
+                character.delete()
+                self.msg("Character '{0}' was permanently "
+                         "deleted.".format(key))
+            else:
+                self.msg("Deletion was aborted.")
+
+        player.ndb._char_to_delete = match[0]
+        get_input(player, "|rThis will permanently destroy '{0}'. This "
+                          "cannot be undone.|n Continue yes/[no]?".format(
+                              match[0].key), _callback)
@@ -1,6 +1,15 @@
-from evennia.utils.evmenu import EvMenu
+from math import isinf, isnan
+
+from django.conf import settings
 
 from commands.command import Command
+from typeclasses.scripts import get_movement_script
+from utils.is_etype import is_construct
+from utils.menu import EvMenu
+from utils.spatial import CONSTRUCT_INDEX
+
+# Longest range sensors scan; larger ranges are cut down to it.
+MAX_SENSOR_RANGE = getattr(settings, "MAX_SENSOR_RANGE", 100000)
 
 
 class CmdEngineer(Command):
@@ -10,5 +19,119 @@ class CmdEngineer(Command):
     def func(self):
         EvMenu(
             self.caller,
-            "menus.constructs",
+            "menus.construct",
             startnode="start")
+
+
+class CmdSensors(Command):
+    """
+    scan for nearby constructs
+
+    Usage:
+      sensors
+      sensors <range>
+
+    Without a range, lists the constructs in the same sector as the one
+    you are aboard. With a range, lists every construct within that
+    distance, nearest first. Sensors have a limited range.
+    """
+    key = "sensors"
+    help_category = "Constructs"
+
+    def func(self):
+        construct = self.caller.location
+        if not construct or not is_construct(construct):
+            self.caller.msg("You need to be aboard a ship to use sensors.")
+            return
+
+        position = CONSTRUCT_INDEX.get_position(construct)
+        if position is None:
+            self.caller.msg("Sensors cannot get a fix on your position.")
+            return
+
+        args = self.args.strip()
+        if args:
+            try:
+                radius = float(args)
+            except ValueError:
+                radius = None
+            if radius is None or isinf(radius) or isnan(radius):
+                self.caller.msg("Usage: sensors [range]")
+                return
+            if radius > MAX_SENSOR_RANGE:
+                self.caller.msg("Sensors reach {0} at most.".format(
+                    MAX_SENSOR_RANGE))
+                radius = MAX_SENSOR_RANGE
+            contacts = [(distance, obj) for distance, obj
+                        in CONSTRUCT_INDEX.in_range(position, radius)
+                        if obj != construct]
+        else:
+            contacts = [(0, obj) for obj in CONSTRUCT_INDEX.in_sector(
+                CONSTRUCT_INDEX.get_sector(position)) if obj != construct]
+
+        if not contacts:
+            self.caller.msg("No contacts.")
+            return
+
+        lines = ["Contacts:"]
+        for distance, obj in contacts:
+            if args:
+                lines.append("  {0} ({1:.1f})".format(obj.key, distance))
+            else:
+                lines.append("  {0}".format(obj.key))
+        self.caller.msg("\n".join(lines))
+
+
+class CmdHelm(Command):
+    """
+    steer the ship you are aboard
+
+    Usage:
+      helm
+      helm <x> <y> <z>
+      helm stop
+
+    Without arguments, shows the ship's position and velocity. With a
+    velocity (distance per second along each axis), sets the ship moving;
+    "helm stop" brings it to a halt.
+    """
+    key = "helm"
+    help_category = "Constructs"
+
+    def func(self):
+        construct = self.caller.location
+        if not construct or not is_construct(construct):
+            self.caller.msg("You need to be aboard a ship to take the helm.")
+            return
+
+        args = self.args.strip()
+        if not args:
+            position = construct.coordinates or (0, 0, 0)
+            velocity = construct.db.velocity or (0, 0, 0)
+            self.caller.msg("Position: {0}\nVelocity: {1}".format(
+                _format_vector(position), _format_vector(velocity)))
+            return
+
+        if args.lower() == "stop":
+            velocity = (0, 0, 0)
+        else:
+            try:
+                velocity = tuple(float(arg) for arg in args.split())
+            except ValueError:
+                velocity = ()
+            if len(velocity) != 3 or \
+                    any(isinf(value) or isnan(value) for value in velocity):
+                self.caller.msg("Usage: helm [<x> <y> <z> | stop]")
+                return
+
+        get_movement_script().set_velocity(construct, velocity)
+        if any(velocity):
+            self.caller.msg("Course set: {0}.".format(
+                _format_vector(velocity)))
+        else:
+            self.caller.msg("All stop.")
+
+
+def _format_vector(vector):
+    return "({0})".format(", ".join("{0:.1f}".format(value)
+                                    for value in vector))
@@ -16,8 +16,24 @@ own cmdsets by inheriting from them or directly from `evennia.CmdSet`.
 
 from evennia import default_cmds
 
-from commands.command import CmdOOCLook
-from commands.construct import CmdEngineer
+from utils.lazy import import_object
+
+# Game commands are given by path and imported when a cmdset is first
+# created, so loading this module (at every start and @reload) does not
+# import every command module and what they depend on.
+CHARACTER_COMMANDS = (
+    "commands.construct.CmdEngineer",
+    "commands.construct.CmdSensors",
+    "commands.construct.CmdHelm",
+    "commands.admin.CmdPrototypes",
+    "commands.admin.CmdMovementStats",
+)
+PLAYER_COMMANDS = (
+    "commands.command.CmdOOCLook",
+    "commands.command.CmdCharCreate",
+    "commands.command.CmdCharDelete",
+    "commands.admin.CmdImportProfile",
+)
 
 
 class CharacterCmdSet(default_cmds.CharacterCmdSet):
@@ -36,7 +52,8 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         #
         # any commands you add below will overload the default ones.
         #
-        self.add(CmdEngineer)
+        for path in CHARACTER_COMMANDS:
+            self.add(import_object(path))
 
 
 class PlayerCmdSet(default_cmds.PlayerCmdSet):
@@ -56,7 +73,8 @@ class PlayerCmdSet(default_cmds.PlayerCmdSet):
         #
         # any commands you add below will overload the default ones.
         #
-        self.add(CmdOOCLook)
+        for path in PLAYER_COMMANDS:
+            self.add(import_object(path))
 
 
 class UnloggedinCmdSet(default_cmds.UnloggedinCmdSet):
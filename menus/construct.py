@@ -1,20 +1,23 @@
+from utils.menu import get_user_yesno
+from utils.shipyard import SHIP_MODIFICATIONS, get_docked_ships, \
+    modify_ship, purchase_ship, repair_ship
+
+
 def start(caller):
-    option1 = True
-    option2 = False
     text = "Welcome to Origins Foundation Dock. How can I help you today?"
     options = (
         {
             "desc": "I would like to purchase a new ship.",
-            "goto": "start",
-            "exec": new_ship
+            "goto": "confirm_purchase",
         },
         {
             "desc": "I would like to modify my ship.",
-            "goto": "start",
+            "goto": "modify",
         },
         {
             "desc": "I would like to repair my ship.",
             "goto": "start",
+            "exec": repair
         },
         {
             "desc": "Exit",
@@ -25,10 +28,67 @@ def start(caller):
     return text, options
 
 
+def confirm_purchase(caller):
+    text = "Purchase a new shuttle (|gY|n/|rN|n)?"
+    options = get_user_yesno("purchased", "start", yes_exec=new_ship)
+    return text, options
+
+
+# Purchases land here rather than back at the start so repeated input
+# cannot buy a second ship.
+def purchased(caller):
+    text = "Your new ship is ready at the dock."
+    options = ({"desc": "Back", "goto": "start"},)
+    return text, options
+
+
+def modify(caller):
+    ship = _get_ship(caller)
+    if not ship:
+        return "You have no ship docked here.", ({"desc": "Back",
+                                                  "goto": "start"},)
+
+    text = "What would you like done to {0}?".format(ship.key)
+    options = tuple({
+                        "desc": desc,
+                        "goto": "start",
+                        "exec": _modify_exec(attribute, value)
+                    } for attribute, value, desc in SHIP_MODIFICATIONS)
+    options += ({"desc": "Back", "goto": "start"},)
+    return text, options
+
+
 def exit(caller):
     text = "Goodbye for now!"
     return text, None
 
 
 def new_ship(caller):
-    caller.msg("Making ship!")
+    purchase_ship(caller, caller.location)
+
+
+def repair(caller):
+    ship = _get_ship(caller)
+    if not ship:
+        caller.msg("You have no ship docked here.")
+    elif repair_ship(ship):
+        caller.msg("{0} has been repaired.".format(ship.key))
+    else:
+        caller.msg("{0} does not need repairs.".format(ship.key))
+
+
+def _modify_exec(attribute, value):
+    def _modify(caller):
+        ship = _get_ship(caller)
+        if not ship:
+            caller.msg("You have no ship docked here.")
+        elif modify_ship(ship, attribute, value):
+            caller.msg("The work on {0} is done.".format(ship.key))
+        else:
+            caller.msg("{0} already has that.".format(ship.key))
+    return _modify
+
+
+def _get_ship(caller):
+    ships = get_docked_ships(caller, caller.location)
+    return ships[0] if ships else None
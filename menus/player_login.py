@@ -1,20 +1,30 @@
-from django.conf import settings
-
-from evennia.objects.models import ObjectDB
-from evennia.utils import create
-
-from utils.format import format_invalid, format_valid
-from utils.menu import nodetext_only_formatter, reset_node_formatter, \
-    get_user_input, get_user_yesno, wrap_exec
+from utils.account import get_account_snapshot, invalidate_account_snapshot
+from utils.character_names import CHARACTER_NAMES
+from utils.characters import create_character
+from utils.format import format_invalid, format_valid, send_styled, \
+    styled
+from utils.menu import cached_node, nodetext_only_formatter, \
+    option_template, reset_node_formatter, get_paged_options, \
+    get_user_input, get_user_yesno
 from utils.session import get_session_address
 
 
 def option_start(session):
     reset_node_formatter(session)
+    return _render_start(session)
 
-    num_chars = _get_num_characters(session)
-    max_chars = _get_max_characters(session)
-    is_available_slots = session.player.is_superuser or num_chars < max_chars
+
+def _get_start_version(session):
+    selected_character = _get_selected_character(session)
+    return (_get_snapshot(session).version,
+            selected_character.id if selected_character else None)
+
+
+@cached_node(_get_start_version)
+def _render_start(session):
+    snapshot = _get_snapshot(session)
+    num_chars = snapshot.num_characters
+    max_chars = snapshot.max_characters
 
     selected_character = _get_selected_character(session)
     if selected_character:
@@ -22,18 +32,16 @@ def option_start(session):
     else:
         selected_character_name = format_invalid("Unavailable")
 
-    num_sessions = len(session.player.sessions.all())
-
     text = _generate_title(session,
                            selected_character_name,
                            num_chars,
                            max_chars,
-                           is_available_slots,
-                           num_sessions)
+                           snapshot.is_available_slots,
+                           snapshot.num_sessions)
 
     options = _get_option_login(selected_character)
     options += _get_option_select_character(num_chars)
-    options += _get_option_create_new_character(num_chars < max_chars)
+    options += _get_option_create_new_character(snapshot.is_available_slots)
     options += _get_option_delete_characters(num_chars)
     options += _get_option_view_sessions()
     options += _get_option_quit()
@@ -47,6 +55,7 @@ def option_login(session):
         character = _get_selected_character(session)
         session.player.puppet_object(session, character)
         session.player.db._last_puppet = character
+        invalidate_account_snapshot(session.player)
     except RuntimeError as ex:
         if character:
             session.msg(
@@ -62,8 +71,8 @@ def option_login(session):
 # region Option Select Character
 
 def option_select_character(session):
-    text = "Select a character:"
-    options = _get_option_select_character_list(session)
+    page_text, options = _get_option_select_character_list(session)
+    text = "Select a character ({0}, type to filter):".format(page_text)
     return text, options
 
 
@@ -86,11 +95,9 @@ def option_create_new_character(session):
 
 def exec_validate_character_name(session, raw_string):
     # TODO Fix the capitalization of multi part name.
-    character_name = raw_string
-    existing_character = ObjectDB.objects.get_objs_with_key_and_typeclass(
-        character_name, settings.BASE_CHARACTER_TYPECLASS)
+    character_name = raw_string.strip()
 
-    if existing_character:
+    if not CHARACTER_NAMES.reserve(character_name, session.sessid):
         _display_invalid_msg(
             session, "{0} is already taken. Try again.".format(character_name))
         return "option_create_new_character"
@@ -102,10 +109,15 @@ def exec_validate_character_name(session, raw_string):
 def option_confirm_new_character(session):
     text = "Are you sure you want to create {0} (|gY|n/|rN|n)?".format(
         format_valid(_get_new_character_name(session)))
-    options = get_user_yesno("option_generate_character", "option_start")
+    options = get_user_yesno("option_generate_character", "option_start",
+                             no_exec=exec_release_character_name)
     return text, options
 
 
+def exec_release_character_name(session):
+    CHARACTER_NAMES.release(session.sessid)
+
+
 def option_generate_character(session):
     session.ndb._menutree.new_character = _create_new_character(session)
 
@@ -125,8 +137,9 @@ def exec_select_new_character(session):
 # region Option Delete Character
 
 def option_delete_character(session):
-    text = "Choose character to delete:"
-    options = _get_option_delete_character_list(session)
+    page_text, options = _get_option_delete_character_list(session)
+    text = "Choose character to delete ({0}, type to filter):".format(
+        page_text)
     return text, options
 
 
@@ -137,8 +150,8 @@ def option_confirm_delete_character(session):
            "(|gY|n/|rN|n)?".format(_get_delete_character(session).key.upper())
     options = get_user_yesno("option_start",
                              "option_start",
-                             yes_exec=exec_confirm_delete_character(session),
-                             no_exec=exec_abort_delete_character(session))
+                             yes_exec=exec_confirm_delete_character,
+                             no_exec=exec_abort_delete_character)
     return text, options
 
 
@@ -147,10 +160,6 @@ def exec_confirm_delete_character(session):
     name = delete_character.key
 
     player = session.player
-    player.db._playable_characters = \
-        [character for character in player.db._playable_characters
-         if character != delete_character]
-
     if delete_character == player.db._last_puppet:
         player.db._last_puppet = None
 
@@ -158,7 +167,8 @@ def exec_confirm_delete_character(session):
         _set_selected_character(session, None)
 
     delete_character.delete()
-    session.msg(_display_invalid_msg("{0} has been deleted.".format(name)))
+    invalidate_account_snapshot(player)
+    _display_invalid_msg(session, "{0} has been deleted.".format(name))
 
 
 def exec_abort_delete_character(session):
@@ -170,8 +180,8 @@ def exec_abort_delete_character(session):
 # region Option View Sessions
 
 def option_view_sessions(session):
-    text = "Select a session to disconnect:"
-    options = _get_option_session_list(session)
+    page_text, options = _get_option_session_list(session)
+    text = "Select a session to disconnect ({0}):".format(page_text)
     return text, options
 
 
@@ -190,6 +200,7 @@ def option_quit(session):
 
 # region Menu Options
 
+@option_template
 def _get_option(desc, goto, error_msg=None):
     return ({
                 "desc": format_invalid(desc) if error_msg else desc,
@@ -245,65 +256,26 @@ def _get_option_quit():
 
 
 def _get_option_select_character_list(session):
-    options = ()
-    for character in session.player.db._playable_characters:
-        options += ({
-                        "desc": character.key,
-                        "goto": "option_start",
-                        "exec": wrap_exec(session,
-                                          _set_selected_character,
-                                          character=character)
-                    },)
-
-    options += ({
-                    "desc": "Back",
-                    "goto": "option_start"
-                },)
-
-    return options
+    return get_paged_options(
+        session, "select_character", _get_snapshot(session).characters,
+        _get_character_desc, "option_start", _set_selected_character,
+        "option_select_character", "option_start")
 
 
 def _get_option_delete_character_list(session):
-    options = ()
-    for character in session.player.db._playable_characters:
-        options += ({
-                        "desc": character.key,
-                        "goto": "option_confirm_delete_character",
-                        "exec": wrap_exec(session,
-                                          _set_delete_character,
-                                          character=character)
-                    },)
-
-    options += ({
-                    "desc": "Back",
-                    "goto": "option_start"
-                },)
-
-    return options
+    return get_paged_options(
+        session, "delete_character", _get_snapshot(session).characters,
+        _get_character_desc, "option_confirm_delete_character",
+        _set_delete_character, "option_delete_character", "option_start")
 
 
 def _get_option_session_list(session):
-    options = ()
-    for i_sess, sess in enumerate(session.player.sessions.all()):
-        desc = "{0} ({1})".format(sess.protocol_key,
-                                  get_session_address(sess))
-        if session.sessid == sess.sessid:
-            desc = format_invalid("{0} *".format(desc))
-
-        options += ({
-                        "desc": desc,
-                        "goto": "option_view_sessions",
-                        "exec": wrap_exec(session,
-                                          _disconnect_session,
-                                          disco_session=sess)
-                    },)
-
-    options += ({
-                    "desc": "Back",
-                    "goto": "option_start"
-                },)
-
-    return options
+    return get_paged_options(
+        session, "sessions", _get_snapshot(session).sessions,
+        lambda sess: _get_session_desc(session, sess),
+        "option_view_sessions", _disconnect_session,
+        "option_view_sessions", "option_start",
+        get_name=lambda sess: sess.protocol_key)
 
 
 # endregion
@@ -322,22 +294,25 @@ def _generate_title(caller, selected_character_name, num_chars, max_chars,
     return text
 
 
-def _display_invalid_msg(session, error_msg=None):
-    if error_msg:
-        session.msg(format_invalid("\n*** {0} *** \n\n".format(error_msg)))
+def _get_character_desc(character):
+    return character.key
 
 
-def _get_num_characters(session):
-    # noinspection PyProtectedMember
-    return len(session.player.db._playable_characters)
+def _get_session_desc(session, sess):
+    desc = "{0} ({1})".format(sess.protocol_key, get_session_address(sess))
+    if session.sessid == sess.sessid:
+        desc = format_invalid("{0} *".format(desc))
+    return desc
 
 
-def _get_max_characters(session):
-    if session.player.is_superuser:
-        return "Unlimited"
-    else:
-        return settings.MAX_NR_CHARACTERS if settings.MULTISESSION_MODE > 1 \
-            else 1
+def _display_invalid_msg(session, error_msg=None):
+    if error_msg:
+        send_styled(session, styled(
+            format_invalid("\n*** {0} *** \n\n".format(error_msg))))
+
+
+def _get_snapshot(session):
+    return get_account_snapshot(session.player)
 
 
 def _get_slots(num_char, max_char, is_available_slots):
@@ -352,7 +327,7 @@ def _get_slots(num_char, max_char, is_available_slots):
 
 def _get_selected_character(session):
     if not hasattr(session.ndb._menutree, "selected_character"):
-        _set_selected_character(session, session.player.db._last_puppet)
+        _set_selected_character(session, _get_snapshot(session).last_puppet)
     return session.ndb._menutree.selected_character
 
 
@@ -377,24 +352,7 @@ def _set_delete_character(session, character):
 
 
 def _create_new_character(session):
-    key = _get_new_character_name(session)
-    start_location = ObjectDB.objects.get_id(settings.START_LOCATION)
-    default_home = ObjectDB.objects.get_id(settings.DEFAULT_HOME)
-    permissions = settings.PERMISSION_PLAYER_DEFAULT
-    typeclass = settings.BASE_CHARACTER_TYPECLASS
-    player = session.player
-
-    new_character = create.create_object(typeclass, key=key,
-                                         location=start_location,
-                                         home=default_home,
-                                         permissions=permissions)
-
-    new_character.locks.add(
-        "puppet:id({0}) or pid({1}) or perm(Immortals) or pperm("
-        "Immortals)".format(new_character.id, player.id))
-    player.db._playable_characters.append(new_character)
-
-    return new_character
+    return create_character(session.player, _get_new_character_name(session))
 
 
 def _disconnect_session(session, disco_session):
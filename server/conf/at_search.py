@@ -23,7 +23,12 @@ line to your settings file:
 
     SEARCH_AT_RESULT = "server.conf.at_search.at_search_result"
 
+Searches answered from the indexes in `utils.search_index` (see
+`typeclasses.objects.IndexedSearchMixin`) always use it.
+
 """
+from utils.search_index import MULTIMATCH_SEPARATOR, split_multimatch
+
 
 def at_search_result(matches, caller, query="", quiet=False, **kwargs):
     """
@@ -50,4 +55,27 @@ def at_search_result(matches, caller, query="", quiet=False, **kwargs):
             or `None`. If `None`, any error reporting/handling should
             already have happened.
 
+    Multiple matches are remembered on `caller.ndb._search_matches`, so
+    that a following `2-ball` can pick from them without searching again.
+
     """
+    if len(matches) == 1:
+        return matches[0]
+
+    if not matches:
+        error = kwargs.get("nofound_string") or \
+            "Could not find '{0}'.".format(query)
+    else:
+        caller.ndb._search_matches = (split_multimatch(query)[1].lower(),
+                                      list(matches))
+        error = kwargs.get("multimatch_string") or \
+            "More than one match for '{0}' (please narrow target):".format(
+                query)
+        for num, match in enumerate(matches, 1):
+            error += "\n {0}{1}{2}{3}".format(
+                num, MULTIMATCH_SEPARATOR, match.get_display_name(caller),
+                " (carried)" if match.location == caller else "")
+
+    if not quiet:
+        caller.msg(error)
+    return None
@@ -15,6 +15,40 @@ at_server_cold_start()
 at_server_cold_stop()
 
 """
+import time
+
+from django.conf import settings
+
+from evennia.objects.models import ObjectDB
+from evennia.players.models import PlayerDB
+from evennia.server.models import ServerConfig
+from evennia.typeclasses.attributes import Attribute
+from evennia.utils import logger
+from evennia.utils.utils import class_from_module
+
+from server.conf import cmdparser
+from typeclasses.channels import get_connect_channel
+from typeclasses.constructs import Construct
+from typeclasses.scripts import get_movement_script
+from utils import locks
+from utils.character_names import CHARACTER_NAMES
+from utils.characters import (get_default_home, get_start_location,
+                              preload_characters)
+from utils.lazy import IMPORT_TIMER
+from utils.prototypes import PROTOTYPES
+from utils.spatial import CONSTRUCT_INDEX
+
+# Optional warm-up phases run at the end of at_server_start, in this
+# order. Set STARTUP_WARMUP in settings to a subset, or to an empty
+# tuple to skip warming up. Unknown names are logged and skipped.
+WARMUP_PHASES = ("typeclasses", "locations", "constructs", "characters")
+
+_RELOAD_STOP_KEY = "reload_stop_time"
+
+_TYPECLASS_SETTINGS = ("BASE_OBJECT_TYPECLASS", "BASE_CHARACTER_TYPECLASS",
+                       "BASE_ROOM_TYPECLASS", "BASE_EXIT_TYPECLASS",
+                       "BASE_PLAYER_TYPECLASS", "BASE_SCRIPT_TYPECLASS",
+                       "BASE_CHANNEL_TYPECLASS")
 
 
 def at_server_start():
@@ -22,7 +56,109 @@ def at_server_start():
     This is called every time the server starts up, regardless of
     how it was shut down.
     """
-    pass
+    phases = [
+        ("install hooks", _install_hooks),
+        ("character names", CHARACTER_NAMES.warm),
+        ("construct index", _index_constructs),
+        ("movement script", get_movement_script),
+    ]
+    for name in getattr(settings, "STARTUP_WARMUP", WARMUP_PHASES):
+        if name in _WARMUPS:
+            phases.append(("warm " + name, _WARMUPS[name]))
+        else:
+            logger.log_err("Unknown STARTUP_WARMUP phase '{0}' skipped; "
+                           "expected one of: {1}.".format(
+                               name, ", ".join(WARMUP_PHASES)))
+
+    start = time.time()
+    timings = [(name, _run_phase(name, func)) for name, func in phases]
+    _log_timings(time.time() - start, timings)
+
+
+def _run_phase(name, func):
+    start = time.time()
+    if name.startswith("warm "):
+        # A cache that failed to warm is filled on first use instead, so
+        # this must not stop the server from starting.
+        try:
+            func()
+        except Exception:
+            logger.log_trace("Startup phase '{0}' failed.".format(name))
+    else:
+        func()
+    return time.time() - start
+
+
+def _log_timings(total, timings):
+    lines = ["Server start took {0:.3f}s.".format(total)]
+    reload_stop_time = ServerConfig.objects.conf(_RELOAD_STOP_KEY)
+    if reload_stop_time:
+        ServerConfig.objects.conf(_RELOAD_STOP_KEY, delete=True)
+        lines[0] += " Reload to ready: {0:.3f}s.".format(
+            time.time() - reload_stop_time)
+    lines.extend("  {0:<20} {1:8.3f}s".format(name, seconds)
+                 for name, seconds in timings)
+    logger.log_info("\n".join(lines))
+
+
+def _install_hooks():
+    cmdparser.install()
+    locks.install()
+    if getattr(settings, "IMPORT_PROFILE", False):
+        IMPORT_TIMER.install()
+
+
+def _index_constructs():
+    CONSTRUCT_INDEX.clear()
+    constructs = dict((construct.id, construct)
+                      for construct in Construct.objects.all_family())
+    # One query for every construct's coordinates, rather than one
+    # Attribute lookup per construct.
+    for obj_id, coordinates in Attribute.objects.filter(
+            db_key="coordinates", db_category__isnull=True,
+            objectdb__id__in=list(constructs)).values_list(
+            "objectdb__id", "db_value"):
+        if coordinates:
+            CONSTRUCT_INDEX.update(constructs[obj_id], coordinates)
+
+
+def _warm_typeclasses():
+    # Import the base typeclasses and every prototype's typeclass now,
+    # rather than when the first object of each kind is loaded.
+    for setting in _TYPECLASS_SETTINGS:
+        path = getattr(settings, setting, None)
+        if path:
+            class_from_module(path)
+    for name in PROTOTYPES.names():
+        PROTOTYPES.get(name)
+
+
+def _warm_locations():
+    locations = [location for location in
+                 (get_start_location(), get_default_home()) if location]
+    list(ObjectDB.objects.filter(db_location__in=locations))
+    for location in locations:
+        # Fills the contents cache from the objects loaded above.
+        location.contents
+
+
+def _warm_constructs():
+    # The constructs themselves are already loaded by _index_constructs;
+    # this brings in everything aboard them in one query.
+    list(ObjectDB.objects.filter(
+        db_location__in=Construct.objects.all_family()))
+
+
+def _warm_characters():
+    preload_characters(PlayerDB.objects.filter(db_is_connected=True))
+
+
+_WARMUPS = {
+    "typeclasses": _warm_typeclasses,
+    "locations": _warm_locations,
+    "constructs": _warm_constructs,
+    "characters": _warm_characters,
+}
 
 
 def at_server_stop():
@@ -30,7 +166,11 @@ def at_server_stop():
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
     """
-    pass
+    # Send connect announcements still waiting for their window to end;
+    # the timer that would send them does not survive the restart.
+    channel = get_connect_channel()
+    if channel:
+        channel.announcer.flush()
 
 
 def at_server_reload_start():
@@ -44,7 +184,8 @@ def at_server_reload_stop():
     """
     This is called only time the server stops before a reload.
     """
-    pass
+    # Read back by at_server_start to report the reload-to-ready time.
+    ServerConfig.objects.conf(_RELOAD_STOP_KEY, time.time())
 
 
 def at_server_cold_start():
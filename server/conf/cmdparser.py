@@ -29,7 +29,42 @@ your settings file:
 
     COMMAND_PARSER = "server.conf.cmdparser.cmdparser"
 
+This implementation returns the same matches as the default parser,
+but instead of testing the input against every command key and alias
+it walks a trie of all command names, built once per cmdset. Call
+`install()` (`at_server_start` does) so that the trie is kept on the
+cmdset and dropped when commands are added to or removed from it;
+until then a trie is built for every parse.
+
 """
+from evennia.commands.cmdset import CmdSet
+from evennia.utils.logger import log_trace
+
+# Key in a trie node holding the commands whose name ends there.
+_END = None
+
+_original_methods = {}
+
+
+def install():
+    """
+    Make `CmdSet.add` and `CmdSet.remove` drop the cmdset's cached trie.
+    Safe to call more than once.
+    """
+    for name in ("add", "remove"):
+        if name not in _original_methods:
+            _original_methods[name] = getattr(CmdSet, name)
+            setattr(CmdSet, name, _invalidating(_original_methods[name]))
+
+
+def _invalidating(method):
+    def wrapper(self, *args, **kwargs):
+        self.__dict__.pop("_parser_trie", None)
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
 
 def cmdparser(raw_string, cmdset, caller, match_index=None):
     """
@@ -51,4 +86,93 @@ def cmdparser(raw_string, cmdset, caller, match_index=None):
             (possibly) separate multiple matches.
 
     """
-    # Your implementation here
+    if not raw_string:
+        return []
+
+    l_raw_string = raw_string.lower()
+    matches = []
+    try:
+        node = _get_trie(cmdset)
+        for char in l_raw_string:
+            node = node.get(char)
+            if node is None:
+                break
+            for order, cmdname, cmd in node.get(_END, ()):
+                if not cmd.arg_regex or \
+                        cmd.arg_regex.match(l_raw_string[len(cmdname):]):
+                    matches.append((order, _create_match(cmdname, raw_string,
+                                                         cmd)))
+    except Exception:
+        log_trace("cmdhandler error. raw_input:%s" % raw_string)
+    # Keep the cmdset order the default parser produces, which decides
+    # how ties are broken below.
+    matches = [match for order, match in sorted(matches,
+                                                key=lambda m: m[0])]
+
+    if not matches and "-" in raw_string:
+        # This could be due to the user trying to identify the
+        # command with a #num-<command> style syntax.
+        mindex, new_raw_string = raw_string.split("-", 1)
+        if mindex.isdigit():
+            return cmdparser(new_raw_string, cmdset, caller,
+                             match_index=int(mindex) - 1)
+
+    # only select command matches we are actually allowed to call.
+    matches = [match for match in matches if match[2].access(caller, "cmd")]
+
+    if len(matches) > 1:
+        # See if it helps to analyze the match with preserved case but only
+        # if it leaves at least one match.
+        trimmed = [match for match in matches
+                   if raw_string.startswith(match[0])]
+        if trimmed:
+            matches = trimmed
+
+    if len(matches) > 1:
+        # we still have multiple matches. Sort them by count quality.
+        matches = _best(matches, 3)
+
+    if len(matches) > 1:
+        # still multiple matches. Fall back to ratio-based quality.
+        matches = _best(matches, 4)
+
+    if len(matches) > 1 and match_index is not None and \
+            0 <= match_index < len(matches):
+        # We couldn't separate match by quality, but we have an
+        # index argument to tell us which match to use.
+        matches = [matches[match_index]]
+
+    return matches
+
+
+def _create_match(cmdname, string, cmdobj):
+    cmdlen, strlen = len(cmdname), len(string)
+    mratio = 1 - (strlen - cmdlen) / (1.0 * strlen)
+    return cmdname, string[cmdlen:], cmdobj, cmdlen, mratio
+
+
+def _best(matches, index):
+    matches = sorted(matches, key=lambda match: match[index])
+    quality = [match[index] for match in matches]
+    return matches[-quality.count(quality[-1]):]
+
+
+def _get_trie(cmdset):
+    trie = cmdset.__dict__.get("_parser_trie")
+    if trie is not None:
+        return trie
+
+    trie = {}
+    order = 0
+    for cmd in cmdset.commands:
+        for cmdname in [cmd.key] + list(cmd.aliases):
+            order += 1
+            if not cmdname:
+                continue
+            node = trie
+            for char in cmdname.lower():
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append((order, cmdname, cmd))
+    if _original_methods:
+        cmdset._parser_trie = trie
+    return trie
@@ -19,6 +19,10 @@ Lock functions in this module extend (and will overload same-named)
 lock functions from evennia.locks.lockfuncs.
 
 """
+# The permission lock functions below answer from the permission grants
+# cached by utils.locks instead of walking the hierarchy on every check.
+# Imported under an underscore so they are not picked up as lock functions.
+from utils import locks as _locks
 
 #def myfalse(accessing_obj, accessed_obj, *args, **kwargs):
 #    """
@@ -28,3 +32,65 @@ lock functions from evennia.locks.lockfuncs.
 #    """
 #    print "%s tried to access %s. Access denied." % (accessing_obj, accessed_obj)
 #    return False
+
+
+def aboard(accessing_obj, accessed_obj, *args, **kwargs):
+    """
+    Usage:
+        aboard()
+
+    Passes if accessing_obj is directly inside accessed_obj, e.g. on the
+    construct being checked.
+    """
+    return getattr(accessing_obj, "location", None) == accessed_obj
+
+
+def perm(accessing_obj, accessed_obj, *args, **kwargs):
+    """
+    Usage:
+        perm(<permission>)
+
+    Passes if accessing_obj has the permission, or a higher one in
+    PERMISSION_HIERARCHY. A puppet is checked against its player's
+    permissions, limited by quelling.
+    """
+    return _has_permission(accessing_obj, args, above=False)
+
+
+def perm_above(accessing_obj, accessed_obj, *args, **kwargs):
+    """
+    Usage:
+        perm_above(<permission>)
+
+    Like perm(), but only passes for hierarchy permissions strictly above
+    the one given.
+    """
+    return _has_permission(accessing_obj, args, above=True)
+
+
+def pperm(accessing_obj, accessed_obj, *args, **kwargs):
+    """
+    Usage:
+        pperm(<permission>)
+
+    Like perm(), but checks the player of a puppet.
+    """
+    return _has_permission(_locks.to_player(accessing_obj), args, above=False)
+
+
+def pperm_above(accessing_obj, accessed_obj, *args, **kwargs):
+    """
+    Usage:
+        pperm_above(<permission>)
+
+    Like perm_above(), but checks the player of a puppet.
+    """
+    return _has_permission(_locks.to_player(accessing_obj), args, above=True)
+
+
+def _has_permission(accessing_obj, args, above):
+    try:
+        return _locks.has_permission(accessing_obj, args[0], above=above)
+    except (AttributeError, IndexError):
+        return False
+
@@ -11,8 +11,116 @@ syscommand (see evennia.syscmds). The sending should normally not need
 to be modified.
 
 """
+import re
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils import timezone
+from twisted.internet import reactor
 
 from evennia import DefaultChannel
+from evennia.comms.models import ChannelDB
+from evennia.utils import logger
+from evennia.utils.utils import lazy_property, make_iter
+
+from utils.format import StyledText, send_styled_many
+from utils.is_etype import is_player
+
+_NAME = "\x00name\x00"
+# A name right after a colour code ("|Gbob") or on its own, but not a
+# colour code's letter ("|R").
+_NAME_PATTERN = r"(?<!\|)(?:(?<=\|[a-zA-Z])|(?<!\w)){0}(?!\w)"
+_connect_channel = None
+
+
+def get_connect_channel():
+    """
+    Get the channel connects and disconnects are announced on (the second
+    of `settings.DEFAULT_CHANNELS`), or None if it does not exist.
+    """
+    global _connect_channel
+    if _connect_channel is None:
+        try:
+            _connect_channel = ChannelDB.objects.filter(
+                db_key=settings.DEFAULT_CHANNELS[1]["key"])[0]
+        except Exception:
+            logger.log_trace()
+    return _connect_channel
+
+
+class ConnectAnnouncer(object):
+    """
+    Coalesces connect and disconnect announcements on a channel.
+
+    Announcements are held for `settings.CONNECT_ANNOUNCE_WINDOW` seconds
+    (2 by default) after the first one arrives, then sent as a single
+    channel message in which announcements that only differ by the name
+    are merged, e.g. "Ann, Bob connected". A window of 0 sends every
+    announcement on its own. `at_server_stop` flushes whatever is pending
+    before a reload or shutdown.
+
+    Args:
+        channel (Channel): The channel to announce on.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.window = getattr(settings, "CONNECT_ANNOUNCE_WINDOW", 2)
+        self.events = 0
+        self.messages = 0
+        self._pending = OrderedDict()
+        self._call = None
+
+    def announce(self, message, name):
+        """
+        Queue `message` about `name` (e.g. a player key) for the current
+        window. Only the last announcement about a name in a window is
+        sent, so "Bob connected" followed by "Bob disconnected" is sent
+        as the latter alone.
+        """
+        self.events += 1
+        # Announcements that only differ by the name share a template.
+        template = re.sub(_NAME_PATTERN.format(re.escape(name)), _NAME,
+                          message, count=1)
+        # Re-inserted so the names stay in the order of their last event.
+        self._pending.pop(name, None)
+        self._pending[name] = template
+
+        if not self.window:
+            self.flush()
+        elif self._call is None:
+            self._call = reactor.callLater(self.window, self.flush)
+
+    def flush(self):
+        if self._call is not None and self._call.active():
+            self._call.cancel()
+        self._call = None
+
+        pending, self._pending = self._pending, OrderedDict()
+        if not pending:
+            return
+
+        # Templates in the order of the first name whose last event used
+        # them.
+        names_by_template = OrderedDict()
+        for name, template in pending.items():
+            names_by_template.setdefault(template, []).append(name)
+        lines = [template.replace(_NAME, ", ".join(names))
+                 for template, names in names_by_template.items()]
+        now = timezone.now()
+        self.channel.tempmsg("[{0}, {1:02d}-{2:02d}-{3:02d}({4:02d}:{5:02d})]: "
+                             "{6}".format(self.channel.key, now.year,
+                                          now.month, now.day, now.hour,
+                                          now.minute, "\n".join(lines)))
+        self.messages += 1
+
+    def get_metrics(self):
+        return {
+            "events": self.events,
+            "messages": self.messages,
+            "pending": len(self._pending),
+        }
+
 
 class Channel(DefaultChannel):
     """
@@ -57,4 +165,53 @@ class Channel(DefaultChannel):
         post_send_message(msg) - called just after message was sent to channel
 
     """
-    pass
+
+    @lazy_property
+    def announcer(self):
+        return ConnectAnnouncer(self)
+
+    def distribute_message(self, msgobj, online=False):
+        """
+        Send a message to the subscribers.
+
+        Evennia's version has every receiving session parse the colour
+        markup itself. Here the sessions of all subscribed Players are
+        gathered first and the text is rendered once per client
+        capability, then sent pre-rendered. Other subscribers (bots,
+        objects) still have their own `msg` called.
+
+        Player subscribers do not go through `Player.msg`: the senders'
+        `at_msg_send` and the receiver's `at_msg_receive` hooks are called
+        here as `DefaultPlayer.msg` would, but any override of `msg` on a
+        Player typeclass is bypassed for channel messages.
+
+        Args:
+            msgobj (Msg or TempMsg): The message to send.
+            online (bool, optional): Unused; only connected sessions
+                receive the message either way.
+        """
+        message = msgobj.message
+        senders = make_iter(msgobj.senders)
+        sessions = []
+        for entity in self.subscriptions.all():
+            try:
+                if not is_player(entity):
+                    entity.msg(message, from_obj=msgobj.senders,
+                               options={"from_channel": self.id})
+                    continue
+
+                for sender in senders:
+                    try:
+                        sender.at_msg_send(text=message, to_obj=entity)
+                    except Exception:
+                        logger.log_trace()
+                if entity.at_msg_receive(text=message,
+                                         from_obj=msgobj.senders):
+                    sessions.extend(entity.sessions.all())
+            except Exception:
+                # One failing subscriber must not stop delivery to the
+                # rest, as DefaultPlayer.msg also catches hook errors.
+                logger.log_trace("Cannot send msg to '{0}'.".format(entity))
+
+        send_styled_many(sessions, StyledText(message),
+                         from_channel=self.id)
@@ -9,7 +9,12 @@ creation commands.
 """
 from evennia import DefaultCharacter
 
-class Character(DefaultCharacter):
+from typeclasses.objects import IndexedSearchMixin, RoutedMoveMixin
+from utils.character_names import CHARACTER_NAMES
+from utils.characters import get_character_owner
+
+
+class Character(IndexedSearchMixin, RoutedMoveMixin, DefaultCharacter):
     """
     The Character defaults to reimplementing some of base Object's hook methods with the
     following functionality:
@@ -29,4 +34,22 @@ class Character(DefaultCharacter):
     at_post_puppet - Echoes "PlayerName has entered the game" to the room.
 
     """
-    pass
+
+    def at_object_creation(self):
+        """
+        Called once, when the character is first created. Claims the
+        character's name in the name registry.
+        """
+        super(Character, self).at_object_creation()
+        CHARACTER_NAMES.register(self.key)
+
+    def at_object_delete(self):
+        """
+        Called just before the character is deleted. Frees its name for
+        reuse and drops it from its owner's playable characters.
+        """
+        CHARACTER_NAMES.unregister(self.key)
+        owner = get_character_owner(self)
+        if owner:
+            owner.characters.discard(self)
+        return super(Character, self).at_object_delete()
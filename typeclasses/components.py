@@ -0,0 +1,47 @@
+"""
+Components
+
+Components are the parts fitted inside a Construct (a ship): consoles,
+engines, sensor arrays and so on. Unlike other objects they stay inside
+the construct, and any commands on their cmdsets are offered by the
+construct itself (see `Construct.at_cmdset_get`).
+
+A component's own cmdsets are never merged for the characters around it
+(its `call` lock is `COMPONENT_CALL_LOCK`); the construct's single
+aggregate cmdset replaces them, so the crew does not get every command
+twice and Evennia does not merge one cmdset per component.
+
+"""
+from typeclasses.objects import Object
+from utils.is_etype import is_construct
+
+COMPONENT_CALL_LOCK = "call:false()"
+
+
+class Component(Object):
+    """
+    Add the commands a component provides to its cmdset, e.g. in
+    `at_object_creation`:
+
+        self.cmdset.add(HelmCmdSet, permanent=True)
+
+    """
+
+    def at_object_creation(self):
+        super(Component, self).at_object_creation()
+        self.locks.add(COMPONENT_CALL_LOCK)
+
+    def basetype_posthook_setup(self):
+        # Components created straight inside a construct never pass
+        # through its at_object_receive. This runs after
+        # at_object_creation, so the component's cmdsets are in place.
+        super(Component, self).basetype_posthook_setup()
+        if is_construct(self.location):
+            self.location.add_components([self])
+
+    def at_object_delete(self):
+        # Deleted objects do not leave their location through
+        # at_object_leave.
+        if is_construct(self.location):
+            self.location.remove_components([self])
+        return super(Component, self).at_object_delete()
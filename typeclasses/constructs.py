@@ -1,8 +1,120 @@
+from django.db import transaction
+
+from evennia import CmdSet
+from evennia.objects.models import ObjectDB
+
+from typeclasses.components import COMPONENT_CALL_LOCK
 from typeclasses.objects import Object
-from utils.is_etype import is_exit
+from utils.is_etype import is_component, is_exit
+from utils.search_index import LOCATION_INDEX
+from utils.spatial import CONSTRUCT_INDEX
+
+
+class ComponentCmdSet(CmdSet):
+    """
+    The commands of every component inside a construct, kept up to date
+    by the construct as components come and go.
+    """
+    key = "ConstructComponents"
+
+    def at_cmdset_creation(self):
+        # Command key -> [(component id, command), ...]; the last provider
+        # of a key is the one in the cmdset.
+        self.providers = {}
+
+    def add_component(self, component):
+        # Components created before their call lock existed.
+        if component.locks.get("call") != COMPONENT_CALL_LOCK:
+            component.locks.add(COMPONENT_CALL_LOCK)
+        for cmdset in component.cmdset.all():
+            for cmd in cmdset.commands:
+                providers = self.providers.setdefault(cmd.key, [])
+                providers.append((component.id, cmd))
+                self.add(cmd)
+
+    def remove_component(self, component):
+        for key, providers in list(self.providers.items()):
+            remaining = [provider for provider in providers
+                         if provider[0] != component.id]
+            if len(remaining) == len(providers):
+                continue
+
+            self.remove(providers[-1][1])
+            if remaining:
+                self.providers[key] = remaining
+                self.add(remaining[-1][1])
+            else:
+                del self.providers[key]
+
+
+# Only those aboard get the construct's cmdsets, including the components'
+# commands; characters next to it in the dock do not.
+CONSTRUCT_CALL_LOCK = "call:aboard()"
 
 
 class Construct(Object):
+    def at_object_creation(self):
+        super(Construct, self).at_object_creation()
+        self.locks.add(CONSTRUCT_CALL_LOCK)
+
+    @property
+    def coordinates(self):
+        # Moving constructs are ahead of the database between flushes of
+        # the movement script; the index always has the latest position.
+        return CONSTRUCT_INDEX.get_position(self) or self.db.coordinates
+
+    @coordinates.setter
+    def coordinates(self, position):
+        # A moving construct's position is held by the movement script,
+        # which would overwrite a direct write on its next tick.
+        script = _find_movement_script()
+        if script:
+            script.set_position(self, position)
+        else:
+            position = tuple(position)
+            self.db.coordinates = position
+            CONSTRUCT_INDEX.update(self, position)
+
+    def at_object_delete(self):
+        script = _find_movement_script()
+        if script:
+            script.forget(self)
+        CONSTRUCT_INDEX.remove(self)
+        return super(Construct, self).at_object_delete()
+
+    def update_attributes(self, changes):
+        """
+        Write only the Attributes whose values differ from `changes`.
+
+        Args:
+            changes (dict): Attribute names mapped to their new values.
+
+        Returns:
+            changed (list): The names of the Attributes actually written.
+        """
+        changed = [key for key, value in changes.items()
+                   if self.attributes.get(key) != value]
+        for key in changed:
+            self.attributes.add(key, changes[key])
+        return changed
+
+    def route_arrival(self, moved_obj, source_location):
+        """
+        Called by `RoutedMoveMixin.move_to` before an object moves here,
+        so it can go straight to where it will end up.
+
+        Args:
+            moved_obj (evennia.objects.objects.DefaultObject):
+            source_location (evennia.objects.objects.DefaultObject):
+
+        Returns:
+            destination (evennia.objects.objects.DefaultObject):
+        """
+        if is_exit(moved_obj) or is_component(moved_obj) or \
+                source_location == self.location:
+            return self
+        return self.location
+
     def at_object_receive(self, moved_obj, source_location):
         """
         Args:
@@ -11,13 +123,130 @@ class Construct(Object):
         """
         if is_exit(moved_obj):
             return
+        elif is_component(moved_obj):
+            self.add_components([moved_obj])
         elif source_location == self.location:
             pass  # TODO: Move to default exit
         else:
+            # Only reached by objects that bypassed route_arrival.
             moved_obj.move_to(self.location, quiet=True, move_hooks=False)
 
+    def at_object_leave(self, moved_obj, target_location):
+        """
+        Args:
+            moved_obj (evennia.objects.objects.DefaultObject):
+            target_location (evennia.objects.objects.DefaultObject):
+        """
+        if is_component(moved_obj):
+            self.remove_components([moved_obj])
+
+    def board(self, objs):
+        """
+        Move many objects into the construct at once.
+
+        Unlike `move_to`, no move hooks, messages or lock checks run, so
+        this is meant for code that has already decided the move is
+        allowed (e.g. a crew boarding together).
+
+        Args:
+            objs (iterable): Objects to bring aboard.
+        """
+        objs = [obj for obj in objs if obj.location != self]
+        self._move_many(objs, self)
+        self.add_components([obj for obj in objs if is_component(obj)])
+
+    def disembark(self, objs):
+        """
+        Move many objects from the construct to its location at once. See
+        `board`.
+
+        Args:
+            objs (iterable): Objects to put off the construct.
+        """
+        objs = [obj for obj in objs if obj.location == self]
+        self.remove_components([obj for obj in objs if is_component(obj)])
+        self._move_many(objs, self.location)
+
+    @staticmethod
+    def _move_many(objs, destination):
+        objs = [obj for obj in objs if obj.location != destination]
+        if not objs:
+            return
+
+        with transaction.atomic():
+            ObjectDB.objects.filter(
+                id__in=[obj.id for obj in objs]
+            ).update(db_location=destination)
+
+        for obj in objs:
+            source_location = obj.location
+            # The rows are already written; only update the cached
+            # instances and the in-memory contents of both containers.
+            obj.db_location = destination
+            if source_location:
+                source_location.contents_cache.remove(obj)
+                LOCATION_INDEX.invalidate(source_location)
+            if destination:
+                destination.contents_cache.add(obj)
+        LOCATION_INDEX.invalidate(destination)
+
+    def add_components(self, components):
+        """
+        Offer the commands of components now inside the construct.
+
+        Args:
+            components (list): The components.
+        """
+        component_cmdset = self.ndb._component_cmdset
+        # Until the aggregate is first built, it is built from the
+        # contents, which already hold the components.
+        if component_cmdset is None or not components:
+            return
+        for component in components:
+            component_cmdset.add_component(component)
+        # The merged current cmdset is a separate object from the
+        # aggregate on the stack.
+        self.cmdset.update()
+
+    def remove_components(self, components):
+        """
+        Stop offering the commands of components leaving the construct
+        (or being deleted).
+
+        Args:
+            components (list): The components.
+        """
+        component_cmdset = self.ndb._component_cmdset
+        if component_cmdset is None or not components:
+            return
+        for component in components:
+            component_cmdset.remove_component(component)
+        self.cmdset.update()
+
     def at_cmdset_get(self, **kwargs):
-        pass  # self.contents
+        component_cmdset = self._get_component_cmdset()
+        if not self.cmdset.has_cmdset(component_cmdset.key):
+            self.cmdset.add(component_cmdset, permanent=False)
+
+    def _get_component_cmdset(self):
+        # Built from the contents once after a reload, then kept current
+        # through add_components and remove_components.
+        component_cmdset = self.ndb._component_cmdset
+        if component_cmdset is None:
+            # Constructs created before their call lock existed.
+            if self.locks.get("call") != CONSTRUCT_CALL_LOCK:
+                self.locks.add(CONSTRUCT_CALL_LOCK)
+            component_cmdset = self.ndb._component_cmdset = ComponentCmdSet()
+            for obj in self.contents:
+                if is_component(obj):
+                    component_cmdset.add_component(obj)
+        return component_cmdset
 
     def return_appearance(self, looker):
         ""
+
+
+def _find_movement_script():
+    # Imported here, as the movement script module imports this one.
+    from typeclasses.scripts import get_movement_script
+    return get_movement_script(create=False)
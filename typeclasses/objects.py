@@ -12,8 +12,145 @@ inheritance.
 """
 from evennia.objects.objects import DefaultObject
 
+from server.conf.at_search import at_search_result
+from utils.search_index import (GLOBAL_KEY_INDEX, LOCATION_INDEX, get_names,
+                                split_multimatch)
 
-class Object(DefaultObject):
+# Keyword arguments the indexed search can honour; any other one (a
+# typeclass, candidates, attribute_name...) goes to Evennia's search.
+_INDEXED_SEARCH_KWARGS = set(["nofound_string", "multimatch_string"])
+
+
+class IndexedSearchMixin(object):
+    """
+    Answers plain name searches from `utils.search_index`.
+
+    Exact searches look up the searcher's contents and location (or, for
+    global searches, the whole database) by key or alias. A non-exact
+    local search is only answered from the index when some object's key
+    is the whole name and no other candidate has a key word starting with
+    it, since Evennia's partial matching would otherwise also match those
+    (`ball` multimatches `red ball`). `2-ball` picks from the matches of
+    the previous ambiguous search without searching again. Everything
+    else is left to Evennia's search.
+    """
+
+    def search(self, searchdata, global_search=False, use_nicks=True,
+               quiet=False, exact=False, **kwargs):
+        if not hasattr(searchdata, "lower") or \
+                set(kwargs) - _INDEXED_SEARCH_KWARGS or \
+                (global_search and not exact) or \
+                searchdata.lower() in ("here", "me", "self") or \
+                searchdata.startswith(("#", "*")):
+            return super(IndexedSearchMixin, self).search(
+                searchdata, global_search=global_search, use_nicks=use_nicks,
+                quiet=quiet, exact=exact, **kwargs)
+
+        if use_nicks:
+            searchdata = self.nicks.nickreplace(
+                searchdata, categories=("object", "player"),
+                include_player=True)
+
+        index, name = split_multimatch(searchdata)
+        matches = self._get_previous_match(index, name, global_search)
+        if matches is None:
+            if global_search:
+                matches = GLOBAL_KEY_INDEX.search(name)
+            elif exact:
+                matches = self._search_local(name)
+            else:
+                matches = self._search_local_partial(name)
+            if not matches:
+                return super(IndexedSearchMixin, self).search(
+                    searchdata, global_search=global_search, use_nicks=False,
+                    quiet=quiet, exact=exact, **kwargs)
+            if index is not None:
+                matches = matches[index:index + 1] if index >= 0 else []
+
+        if quiet:
+            return matches
+        return at_search_result(matches, self, query=searchdata, **kwargs)
+
+    def _search_local(self, name):
+        location = self.location
+        matches = LOCATION_INDEX.search(self, name)
+        if location:
+            matches.extend(LOCATION_INDEX.search(location, name))
+            extra = location
+        else:
+            extra = self
+        if name.lower() in get_names(extra):
+            matches.append(extra)
+        return matches
+
+    def _search_local_partial(self, name):
+        """
+        Get the objects a non-exact search for `name` matches, or an
+        empty list if the index cannot tell them apart from partial
+        matches.
+        """
+        name = name.lower()
+        words = name.split()
+        matches = [obj for obj in self._search_local(name)
+                   if obj.key.lower() == name] if words else []
+        if not matches:
+            return []
+
+        location = self.location
+        first_word = words[0]
+        candidates = LOCATION_INDEX.search_prefix(self, first_word)
+        if location:
+            candidates.extend(LOCATION_INDEX.search_prefix(location,
+                                                           first_word))
+        extra = location or self
+        if any(word.startswith(first_word)
+               for word in extra.key.lower().split()):
+            candidates.append(extra)
+        if any(obj not in matches for obj in candidates):
+            return []
+        return matches
+
+    def _get_previous_match(self, index, name, global_search):
+        previous = self.ndb._search_matches
+        if index is None or not previous or previous[0] != name.lower() or \
+                not 0 <= index < len(previous[1]):
+            return None
+
+        match = previous[1][index]
+        if not match.pk:
+            return None
+        if global_search or match == self.location or \
+                match.location in (self, self.location):
+            return [match]
+        return None
+
+
+class RoutedMoveMixin(object):
+    """
+    Lets the destination of a move redirect it before anything is saved.
+
+    If the destination defines `route_arrival(moved_obj, source_location)`,
+    the object is moved straight to whatever location it returns, instead
+    of arriving and being moved on from `at_object_receive`.
+
+    Both locations' search indexes are invalidated after a move.
+    """
+
+    def move_to(self, destination, *args, **kwargs):
+        route_arrival = getattr(destination, "route_arrival", None)
+        if route_arrival:
+            destination = route_arrival(self, self.location)
+
+        source_location = self.location
+        moved = super(RoutedMoveMixin, self).move_to(destination, *args,
+                                                     **kwargs)
+        if moved:
+            LOCATION_INDEX.invalidate(source_location)
+            LOCATION_INDEX.invalidate(self.location)
+        return moved
+
+
+class Object(IndexedSearchMixin, RoutedMoveMixin, DefaultObject):
     """
     This is the root typeclass object, implementing an in-game Evennia
     game object, such as having a location, being able to be
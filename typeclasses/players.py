@@ -21,9 +21,17 @@ possibility to connect with a guest account. The setting file accepts
 several more options for customizing the Guest account system.
 
 """
+import time
+
 from django.conf import settings
 from evennia import DefaultGuest
 from evennia.players.players import DefaultPlayer
+from evennia.utils.utils import lazy_property
+
+from typeclasses.channels import get_connect_channel
+from utils.account import LOGIN_METRICS, get_account_snapshot, \
+    invalidate_account_snapshot, open_account_menu
+from utils.characters import CharacterHandler
 
 
 class Player(DefaultPlayer):
@@ -66,6 +74,8 @@ class Player(DefaultPlayer):
      scripts - script-handler. Add new scripts to object with scripts.add()
      cmdset - cmdset-handler. Use cmdset.add() to add new cmdsets to object
      nicks - nick-handler. New nicks with nicks.add().
+     characters - playable characters. Use characters.add() and
+        characters.all() instead of the old _playable_characters list.
 
     * Helper methods
 
@@ -100,6 +110,10 @@ class Player(DefaultPlayer):
 
     """
 
+    @lazy_property
+    def characters(self):
+        return CharacterHandler(self)
+
     def at_post_login(self, session=None):
         """
         Called at the end of the login process, just before letting
@@ -114,31 +128,56 @@ class Player(DefaultPlayer):
             auto-puppeting based on `MULTISESSION_MODE`.
 
         """
+        start = time.time()
+
+        # The snapshot loads the saved protocol flags, last puppet and
+        # characters together; the account menu then renders from it.
+        invalidate_account_snapshot(self)
+        snapshot = get_account_snapshot(self)
+
         # if we have saved protocol flags on ourselves, load them here.
-        protocol_flags = self.attributes.get("_saved_protocol_flags", None)
-        if session and protocol_flags:
-            session.update_flags(**protocol_flags)
+        if session and snapshot.protocol_flags:
+            session.update_flags(**snapshot.protocol_flags)
 
         self._send_to_connect_channel("|G%s connected|n" % self.key)
         if settings.MULTISESSION_MODE in (0, 1):
             # in this mode we should have only one character available. We
             # try to auto-connect to our last conneted object, if any
             try:
-                self.puppet_object(session, self.db._last_puppet)
+                self.puppet_object(session, snapshot.last_puppet)
             except RuntimeError:
                 self.msg("The Character does not exist.")
-                return
         elif settings.MULTISESSION_MODE in (2, 3):
             # In this mode we by default end up at a character selection
-            # screen. We execute look on the player.
-            # we make sure to clean up the _playable_characers list in case
-            # any was deleted in the interim.
-            self.db._playable_characters = [char for char in
-                                            self.db._playable_characters if
-                                            char]
-            self.execute_cmd("look", session=session)
+            # screen, opened directly rather than through the look
+            # command. Deleted characters remove themselves from
+            # self.characters, so there is no list to clean up here.
+            if session:
+                open_account_menu(session)
 
-    pass
+        LOGIN_METRICS.record(self, time.time() - start)
+
+    def at_disconnect(self, reason=None):
+        """
+        Called just before user is disconnected.
+
+        Args:
+            reason (str, optional): The reason given for the disconnect,
+                (echoed to the connection channel by default).
+
+        """
+        invalidate_account_snapshot(self)
+        super(Player, self).at_disconnect(reason=reason)
+
+    def _send_to_connect_channel(self, message):
+        # Logins and logouts come in bursts after a reload or a network
+        # hiccup, so they are batched by the channel's announcer.
+        channel = get_connect_channel()
+        announcer = getattr(channel, "announcer", None)
+        if announcer:
+            announcer.announce(message, self.key)
+        else:
+            super(Player, self)._send_to_connect_channel(message)
 
 
 class Guest(DefaultGuest):
@@ -11,8 +11,26 @@ Rather, each script tends to inherit from the base Script class and
 just overloads its hooks to have it perform its function.
 
 """
+import time
+
+from django.conf import settings
+from django.db import transaction
 
 from evennia import DefaultScript
+from evennia.scripts.models import ScriptDB
+from evennia.utils.create import create_script
+
+from typeclasses.constructs import Construct
+from utils.spatial import CONSTRUCT_INDEX
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MOVEMENT_SCRIPT_KEY = "construct_movement"
+
+_movement_script = None
 
 
 class Script(DefaultScript):
@@ -89,3 +107,192 @@ class Script(DefaultScript):
 
     """
     pass
+
+
+class ConstructMovementScript(Script):
+    """
+    Global script moving every construct that has a velocity.
+
+    All moving constructs are advanced together once per tick, using
+    NumPy arrays when NumPy is installed. New positions go to the
+    construct spatial index right away and are written to the database
+    every `db.flush_ticks` ticks inside a single transaction, and at
+    reload or stop. `get_metrics` reports the wall time of the ticks.
+
+    Set velocities through `set_velocity` so the script picks them up.
+    `Construct.coordinates` places constructs through `set_position`, so
+    the next tick does not overwrite the new position.
+    """
+
+    def at_script_creation(self):
+        self.key = MOVEMENT_SCRIPT_KEY
+        self.desc = "Moves constructs"
+        self.interval = getattr(settings, "CONSTRUCT_TICK_INTERVAL", 1)
+        self.persistent = True
+        self.db.flush_ticks = getattr(settings, "CONSTRUCT_FLUSH_TICKS", 10)
+
+    def at_start(self):
+        self.ndb.constructs = [
+            construct for construct in Construct.objects.all_family()
+            if _is_moving(construct.db.velocity)]
+        self.ndb.positions = None
+        self.ndb.ticks = 0
+        self.ndb.last_tick_time = 0.0
+        self.ndb.max_tick_time = 0.0
+        self.ndb.total_tick_time = 0.0
+
+    def at_repeat(self):
+        start = time.time()
+
+        if not all(construct.pk for construct in self.ndb.constructs):
+            # Deleted without going through forget().
+            self.forget()
+        if self.ndb.positions is None:
+            self._build_arrays()
+        self.ndb.positions = _advance(self.ndb.positions,
+                                      self.ndb.velocities, self.interval)
+        for construct, position in zip(self.ndb.constructs,
+                                       self.ndb.positions):
+            CONSTRUCT_INDEX.update(construct, position)
+
+        self.ndb.ticks += 1
+        if self.ndb.ticks % self.db.flush_ticks == 0:
+            self.flush()
+
+        tick_time = time.time() - start
+        self.ndb.last_tick_time = tick_time
+        self.ndb.max_tick_time = max(self.ndb.max_tick_time, tick_time)
+        self.ndb.total_tick_time += tick_time
+
+    def at_server_reload(self):
+        self.flush()
+
+    def at_stop(self):
+        self.flush()
+
+    def set_velocity(self, construct, velocity):
+        """
+        Set the velocity of a construct, starting or stopping it.
+
+        Args:
+            construct (Construct): The construct to move.
+            velocity (tuple): Distance per second along each axis.
+        """
+        velocity = tuple(float(component) for component in velocity)
+        self.flush()
+        construct.db.velocity = velocity
+
+        constructs = [moving for moving in self.ndb.constructs
+                      if moving != construct]
+        if _is_moving(velocity):
+            constructs.append(construct)
+        self.ndb.constructs = constructs
+        self.ndb.positions = None
+
+    def set_position(self, construct, position):
+        """
+        Place a construct at `position`, moving or not.
+
+        Args:
+            construct (Construct): The construct to place.
+            position (tuple): The new coordinates.
+        """
+        position = tuple(float(coord) for coord in position)
+        moving = construct in (self.ndb.constructs or ())
+        if moving:
+            self.flush()
+        construct.db.coordinates = position
+        CONSTRUCT_INDEX.update(construct, position)
+        if moving:
+            self.ndb.positions = None
+
+    def forget(self, construct=None):
+        """
+        Stop moving a construct that is being deleted, without writing to
+        it. Constructs already deleted are dropped as well.
+
+        Args:
+            construct (Construct, optional): The construct to drop.
+        """
+        self.flush()
+        self.ndb.constructs = [moving for moving in self.ndb.constructs
+                               if moving is not construct and moving.pk]
+        self.ndb.positions = None
+
+    def flush(self):
+        """
+        Write the in-memory positions of all moving constructs to the
+        database in one transaction.
+        """
+        if self.ndb.positions is None:
+            return
+        with transaction.atomic():
+            for construct, position in zip(self.ndb.constructs,
+                                           self.ndb.positions):
+                if not construct.pk:
+                    continue
+                construct.db.coordinates = tuple(float(coord)
+                                                 for coord in position)
+
+    def get_metrics(self):
+        ticks = self.ndb.ticks or 0
+        return {
+            "moving": len(self.ndb.constructs or ()),
+            "ticks": ticks,
+            "last_tick_time": self.ndb.last_tick_time or 0.0,
+            "max_tick_time": self.ndb.max_tick_time or 0.0,
+            "average_tick_time":
+                self.ndb.total_tick_time / ticks if ticks else 0.0,
+        }
+
+    def _build_arrays(self):
+        constructs = self.ndb.constructs
+        self.ndb.positions = _to_array(
+            [construct.coordinates or (0, 0, 0) for construct in constructs])
+        self.ndb.velocities = _to_array(
+            [construct.db.velocity for construct in constructs])
+
+
+def get_movement_script(create=True):
+    """
+    Get the global construct movement script.
+
+    The script is looked up once and then remembered for as long as it
+    exists.
+
+    Args:
+        create (bool, optional): Create the script if it does not exist.
+
+    Returns:
+        script (ConstructMovementScript or None): None if the script does
+            not exist and `create` is False.
+    """
+    global _movement_script
+    if _movement_script is None or not _movement_script.pk:
+        scripts = ScriptDB.objects.get_all_scripts(key=MOVEMENT_SCRIPT_KEY)
+        if scripts:
+            _movement_script = scripts[0]
+        elif create:
+            _movement_script = create_script(ConstructMovementScript,
+                                             key=MOVEMENT_SCRIPT_KEY)
+        else:
+            return None
+    return _movement_script
+
+
+def _is_moving(velocity):
+    return bool(velocity) and any(velocity)
+
+
+def _to_array(rows):
+    if numpy:
+        return numpy.array(rows, dtype=float).reshape(-1, 3)
+    return [[float(value) for value in row] for row in rows]
+
+
+def _advance(positions, velocities, seconds):
+    if numpy:
+        positions += velocities * seconds
+        return positions
+    return [[p + v * seconds for p, v in zip(position, velocity)]
+            for position, velocity in zip(positions, velocities)]
@@ -0,0 +1,104 @@
+from itertools import count
+
+from django.conf import settings
+
+from evennia.utils import logger
+
+from utils.menu import EvMenu
+
+ACCOUNT_MENU = "menus.player_login"
+
+_VERSIONS = count(1)
+
+
+class AccountSnapshot(object):
+    """
+    Read-only view of the account state shown by the login menu.
+
+    Built once from the player's Attributes and session list and kept on
+    `player.ndb` until something that changes it calls
+    `invalidate_account_snapshot`, so menu redraws do not touch the
+    database. Every snapshot gets a new `version`, which callers can use
+    to key anything derived from it.
+
+    Args:
+        player (Player): The player to snapshot.
+    """
+
+    def __init__(self, player):
+        self.version = next(_VERSIONS)
+        self.characters = tuple(player.characters.all())
+        self.num_characters = len(self.characters)
+        self.max_characters = _get_max_characters(player)
+        self.is_available_slots = player.is_superuser or \
+            self.num_characters < self.max_characters
+        # Reading the first Attribute caches all of the player's
+        # Attributes, so these come from a single query.
+        # noinspection PyProtectedMember
+        self.protocol_flags = player.db._saved_protocol_flags
+        # noinspection PyProtectedMember
+        self.last_puppet = player.db._last_puppet
+        self.sessions = tuple(player.sessions.all())
+        self.num_sessions = len(self.sessions)
+
+
+def get_account_snapshot(player):
+    snapshot = player.ndb._account_snapshot
+    if snapshot is None:
+        snapshot = AccountSnapshot(player)
+        player.ndb._account_snapshot = snapshot
+    return snapshot
+
+
+def invalidate_account_snapshot(player):
+    if player:
+        player.ndb._account_snapshot = None
+
+
+def open_account_menu(session, **kwargs):
+    """
+    Show the account screen (the login menu) to `session`.
+    """
+    EvMenu(session, startnode="option_start", menudata=ACCOUNT_MENU,
+           session=session, **kwargs)
+
+
+class LoginMetrics(object):
+    """
+    Wall time spent in `Player.at_post_login`, logged for every login and
+    summed up by `get_metrics`.
+    """
+
+    def __init__(self):
+        self.logins = 0
+        self.last = None
+        self.max = 0.0
+        self.total = 0.0
+
+    def record(self, player, seconds):
+        self.logins += 1
+        self.last = seconds
+        self.max = max(self.max, seconds)
+        self.total += seconds
+        logger.log_info("Login of {0} took {1:.1f} ms.".format(
+            player.key, seconds * 1000))
+
+    def get_metrics(self):
+        return {
+            "logins": self.logins,
+            "last_login_time": self.last,
+            "max_login_time": self.max,
+            "average_login_time":
+                self.total / self.logins if self.logins else 0.0,
+        }
+
+
+LOGIN_METRICS = LoginMetrics()
+
+
+def _get_max_characters(player):
+    if player.is_superuser:
+        return "Unlimited"
+    else:
+        return settings.MAX_NR_CHARACTERS if settings.MULTISESSION_MODE > 1 \
+            else 1
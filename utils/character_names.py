@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+
+from evennia.objects.models import ObjectDB
+
+# Seconds a name stays reserved for a session that never finishes creating
+# the character (e.g. it dropped out of the menu).
+RESERVATION_TIMEOUT = 300
+
+
+def normalize_name(name):
+    return " ".join(name.split()).lower()
+
+
+class CharacterNameRegistry(object):
+    """
+    In-memory set of taken character names, normalized so that names
+    differing only in case or spacing collide.
+
+    The registry is warmed from the database at server start and then kept
+    in sync by the Character typeclass. Names can be reserved by an owner
+    (a session id) between validation and creation; since the server runs
+    in a single reactor thread, `reserve` is atomic.
+    """
+
+    def __init__(self):
+        self._names = None
+        self._reservations = {}
+
+    def warm(self):
+        keys = ObjectDB.objects.filter(
+            db_typeclass_path=settings.BASE_CHARACTER_TYPECLASS
+        ).values_list("db_key", flat=True)
+        self._names = set(normalize_name(key) for key in keys)
+        self._reservations = {}
+
+    def is_taken(self, name, owner=None):
+        name = normalize_name(name)
+        if name in self._get_names():
+            return True
+
+        reservation = self._reservations.get(name)
+        if reservation is None:
+            return False
+
+        reserved_by, expires = reservation
+        if expires < time.time():
+            del self._reservations[name]
+            return False
+        return reserved_by != owner
+
+    def reserve(self, name, owner):
+        if self.is_taken(name, owner):
+            return False
+
+        self.release(owner)
+        self._reservations[normalize_name(name)] = (
+            owner, time.time() + RESERVATION_TIMEOUT)
+        return True
+
+    def release(self, owner):
+        for name, (reserved_by, expires) in list(self._reservations.items()):
+            if reserved_by == owner:
+                del self._reservations[name]
+
+    def register(self, name):
+        name = normalize_name(name)
+        self._get_names().add(name)
+        self._reservations.pop(name, None)
+
+    def unregister(self, name):
+        self._get_names().discard(normalize_name(name))
+
+    def _get_names(self):
+        if self._names is None:
+            self.warm()
+        return self._names
+
+
+CHARACTER_NAMES = CharacterNameRegistry()
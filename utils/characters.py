@@ -0,0 +1,261 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from evennia.objects.models import ObjectDB
+from evennia.players.models import PlayerDB
+from evennia.utils import create
+
+from utils.account import invalidate_account_snapshot
+from utils.character_names import CHARACTER_NAMES, normalize_name
+
+PUPPET_LOCK = "puppet:id({character_id}) or pid({player_id}) or " \
+              "perm(Immortals) or pperm(Immortals)"
+
+PLAYABLE_TAG_CATEGORY = "playable_by"
+
+
+class CharacterHandler(object):
+    """
+    The characters a player can puppet, stored as a tag on each character
+    rather than as a pickled list on the player.
+
+    The characters are loaded once into an ordered map keyed by id, so
+    add, remove, count and membership tests do not query the database
+    beyond writing the tag. Deleted characters remove themselves through
+    `Character.at_object_delete`.
+
+    Characters Evennia appended to the old `_playable_characters` list
+    (e.g. when creating an account) are tagged, and the list emptied, when
+    the map is first filled. The game's `@charcreate` and `@chardelete`
+    replace Evennia's, which use the list.
+
+    Args:
+        player (Player): The owning player.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        self._characters = None
+
+    def all(self):
+        return list(self._load().values())
+
+    def add(self, character):
+        self.add_many([character])
+
+    def add_many(self, characters):
+        loaded = self._load()
+        tag = self._get_tag()
+        for character in characters:
+            if character.id not in loaded:
+                character.tags.add(tag, category=PLAYABLE_TAG_CATEGORY)
+                loaded[character.id] = character
+        invalidate_account_snapshot(self.player)
+
+    def remove(self, character):
+        if self._load().pop(character.id, None) is not None:
+            character.tags.remove(self._get_tag(),
+                                  category=PLAYABLE_TAG_CATEGORY)
+            invalidate_account_snapshot(self.player)
+
+    def discard(self, character):
+        """
+        Forget a character that is being deleted, without touching its
+        (soon to be removed) tags.
+        """
+        if self._characters is not None:
+            self._characters.pop(character.id, None)
+        invalidate_account_snapshot(self.player)
+
+    def count(self):
+        return len(self._load())
+
+    def prime(self, characters):
+        """
+        Fill the handler from characters loaded elsewhere, such as by
+        `preload_characters`, instead of querying them.
+        """
+        self._characters = OrderedDict(
+            (character.id, character) for character in characters)
+        self._migrate_legacy()
+
+    def __contains__(self, character):
+        return character is not None and character.id in self._load()
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def __len__(self):
+        return self.count()
+
+    def _get_tag(self):
+        return str(self.player.id)
+
+    def _load(self):
+        if self._characters is None:
+            characters = ObjectDB.objects.get_by_tag(
+                key=self._get_tag(), category=PLAYABLE_TAG_CATEGORY)
+            self._characters = OrderedDict(
+                (character.id, character)
+                for character in characters.order_by("id"))
+            self._migrate_legacy()
+        return self._characters
+
+    def _migrate_legacy(self):
+        # Tag the characters Evennia only appended to the old list, then
+        # empty it so they are not migrated again. Evennia appends to the
+        # list, so it must stay a list.
+        # noinspection PyProtectedMember
+        legacy = self.player.db._playable_characters
+        if not legacy:
+            return
+        characters = self._characters
+        for character in legacy:
+            if character and character.id not in characters:
+                character.tags.add(self._get_tag(),
+                                   category=PLAYABLE_TAG_CATEGORY)
+                characters[character.id] = character
+        # noinspection PyProtectedMember
+        self.player.db._playable_characters = []
+        invalidate_account_snapshot(self.player)
+
+
+def preload_characters(players):
+    """
+    Load the characters of many players in two queries, rather than one
+    per player the first time each one's `characters` is used.
+
+    Args:
+        players (iterable): Players whose character lists to fill.
+    """
+    players = dict((str(player.id), player) for player in players)
+    if not players:
+        return
+
+    owners = ObjectDB.objects.filter(
+        db_tags__db_category=PLAYABLE_TAG_CATEGORY,
+        db_tags__db_key__in=list(players)
+    ).values_list("id", "db_tags__db_key")
+    characters = ObjectDB.objects.in_bulk([owner[0] for owner in owners])
+
+    loaded = dict((tag, []) for tag in players)
+    for character_id, tag in sorted(owners):
+        if character_id in characters:
+            loaded[tag].append(characters[character_id])
+    for tag, player in players.items():
+        player.characters.prime(loaded[tag])
+
+
+def get_character_owner(character):
+    player_id = character.tags.get(category=PLAYABLE_TAG_CATEGORY)
+    if isinstance(player_id, list):
+        player_id = player_id[0] if player_id else None
+    return PlayerDB.objects.get_id(int(player_id)) if player_id else None
+
+
+def get_start_location():
+    return ObjectDB.objects.get_id(settings.START_LOCATION)
+
+
+def get_default_home():
+    return ObjectDB.objects.get_id(settings.DEFAULT_HOME)
+
+
+def create_character(player, key, start_location=None, default_home=None):
+    """
+    Create a playable character for `player`.
+
+    Args:
+        player (Player): The owner of the new character.
+        key (str): The character name.
+        start_location (Object, optional): Resolved from
+            `settings.START_LOCATION` if not given.
+        default_home (Object, optional): Resolved from
+            `settings.DEFAULT_HOME` if not given.
+
+    Returns:
+        character (Character): The new character.
+    """
+    new_character = _create_character_object(
+        player, key,
+        start_location or get_start_location(),
+        default_home or get_default_home())
+    _add_playable_characters(player, [new_character])
+    return new_character
+
+
+def create_characters(requests):
+    """
+    Create many playable characters at once.
+
+    The start location and home are resolved once, all objects are created
+    in a single transaction and each player's character list is written
+    once for the whole batch.
+
+    Names are checked against the name registry first, like the login menu
+    does, so nothing is created if any name is taken, reserved, or given
+    twice in the batch (names differing only in case or spacing collide).
+
+    Args:
+        requests (iterable): `(player, key)` tuples.
+
+    Returns:
+        characters (list): The new characters, in request order.
+
+    Raises:
+        ValueError: If any of the names can not be used.
+    """
+    requests = list(requests)
+    seen = set()
+    rejected = []
+    for player, key in requests:
+        name = normalize_name(key)
+        if name in seen or CHARACTER_NAMES.is_taken(key):
+            rejected.append(key)
+        seen.add(name)
+    if rejected:
+        raise ValueError("Character names already taken: {0}.".format(
+            ", ".join(rejected)))
+
+    start_location = get_start_location()
+    default_home = get_default_home()
+
+    new_characters = []
+    characters_by_player = OrderedDict()
+    try:
+        with transaction.atomic():
+            for player, key in requests:
+                new_character = _create_character_object(
+                    player, key, start_location, default_home)
+                new_characters.append(new_character)
+                characters_by_player.setdefault(player, []).append(
+                    new_character)
+
+            for player, characters in characters_by_player.items():
+                _add_playable_characters(player, characters)
+    except Exception:
+        # The characters registered their names on creation; the rollback
+        # undid the creation, so free the names again.
+        for player, key in requests:
+            CHARACTER_NAMES.unregister(key)
+        raise
+
+    return new_characters
+
+
+def _create_character_object(player, key, start_location, default_home):
+    new_character = create.create_object(
+        settings.BASE_CHARACTER_TYPECLASS,
+        key=key,
+        location=start_location,
+        home=default_home,
+        permissions=settings.PERMISSION_PLAYER_DEFAULT)
+    new_character.locks.add(PUPPET_LOCK.format(character_id=new_character.id,
+                                               player_id=player.id))
+    return new_character
+
+
+def _add_playable_characters(player, characters):
+    player.characters.add_many(characters)
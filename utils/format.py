@@ -1,3 +1,17 @@
+from collections import defaultdict
+
+from evennia.utils.ansi import parse_ansi
+from evennia.utils.text2html import parse_html
+
+RENDER_PLAIN = "plain"
+RENDER_ANSI = "ansi"
+RENDER_XTERM256 = "xterm256"
+RENDER_HTML = "html"
+
+# Styled fragments are kept for reuse up to this many distinct markups;
+# past that the cache is dropped and refilled with whatever is hot.
+_STYLED_CACHE_SIZE = 1024
+_styled_cache = {}
 
 
 def format_invalid(msg):
@@ -12,4 +26,110 @@ def format_color(msg, color_code):
     return "|{color_code}{msg}|n".format(
         color_code=color_code,
         msg=msg
-    )
\ No newline at end of file
+    )
+
+
+class StyledText(object):
+    """
+    Colour markup that is parsed once per client capability.
+
+    The rendered form for each of `RENDER_PLAIN`, `RENDER_ANSI`,
+    `RENDER_XTERM256` and `RENDER_HTML` is produced on first use and
+    cached, so sending the same text again skips Evennia's markup parse.
+    `str()` gives back the markup, so it can still be used where a plain
+    string is expected.
+
+    Args:
+        markup (str): Text with Evennia colour markup (`|g`, `|n`, ...).
+    """
+
+    def __init__(self, markup):
+        self.markup = markup
+        self._rendered = {}
+
+    def render(self, mode):
+        try:
+            return self._rendered[mode]
+        except KeyError:
+            rendered = self._rendered[mode] = _render(self.markup, mode)
+            return rendered
+
+    def __str__(self):
+        return self.markup
+
+
+def styled(markup):
+    """
+    Get the shared `StyledText` for `markup`.
+    """
+    try:
+        return _styled_cache[markup]
+    except KeyError:
+        if len(_styled_cache) >= _STYLED_CACHE_SIZE:
+            _styled_cache.clear()
+        text = _styled_cache[markup] = StyledText(markup)
+        return text
+
+
+def get_render_mode(session):
+    """
+    Get how text for `session` should be rendered, following the defaults
+    of Evennia's telnet protocol: until TTYPE has been negotiated, colour
+    and xterm256 are assumed.
+    """
+    if session.protocol_key.startswith("webclient"):
+        return RENDER_HTML
+
+    flags = session.protocol_flags
+    if flags.get("TTYPE"):
+        xterm256, ansi = flags.get("XTERM256"), flags.get("ANSI")
+    else:
+        xterm256 = ansi = True
+    if flags.get("NOCOLOR") or not (ansi or xterm256):
+        return RENDER_PLAIN
+    return RENDER_XTERM256 if xterm256 else RENDER_ANSI
+
+
+def send_styled(session, text):
+    """
+    Send a `StyledText` to a session, pre-rendered for its client.
+    """
+    _send(session, text, get_render_mode(session), {})
+
+
+def send_styled_many(sessions, text, **options):
+    """
+    Send a `StyledText` to many sessions, rendering it once per client
+    capability among them rather than once per session.
+
+    Args:
+        sessions (iterable): The sessions to send to.
+        text (StyledText): The text.
+        **options: Extra send options, e.g. `from_channel`.
+    """
+    by_mode = defaultdict(list)
+    for session in sessions:
+        by_mode[get_render_mode(session)].append(session)
+
+    for mode, mode_sessions in by_mode.items():
+        for session in mode_sessions:
+            _send(session, text, mode, options)
+
+
+def _send(session, text, mode, options):
+    # Screen reader clients get the markup, so that the portal strips it
+    # and cleans up the text for them as usual.
+    if session.protocol_flags.get("SCREENREADER"):
+        session.msg(text.markup, options=dict(options))
+    else:
+        session.msg(text.render(mode), options=dict(options, raw=True))
+
+
+def _render(markup, mode):
+    if mode == RENDER_HTML:
+        return parse_html(markup)
+    # Close any colour left open at the end, as the telnet protocol does
+    # for text it parses itself.
+    return parse_ansi(markup + "|n",
+                      strip_ansi=mode == RENDER_PLAIN,
+                      xterm256=mode == RENDER_XTERM256)
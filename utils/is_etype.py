@@ -1,7 +1,93 @@
 from evennia.utils import inherits_from
 
-from typeclasses.exits import Exit
+# Typeclasses are given by path so this module can be imported from the
+# typeclass modules themselves.
+EXIT = "typeclasses.exits.Exit"
+ROOM = "typeclasses.rooms.Room"
+CHARACTER = "typeclasses.characters.Character"
+CONSTRUCT = "typeclasses.constructs.Construct"
+COMPONENT = "typeclasses.components.Component"
+PLAYER = "typeclasses.players.Player"
+
+OTHER = "other"
+
+# Checked in order by get_etype; the first match wins.
+ETYPES = (
+    ("exit", EXIT),
+    ("room", ROOM),
+    ("character", CHARACTER),
+    ("construct", CONSTRUCT),
+    ("component", COMPONENT),
+    ("player", PLAYER),
+)
+
+# inherits_from only depends on the class, so answers are kept per
+# concrete class and the MRO is walked once per class and typeclass.
+_inherits_cache = {}
+_etype_cache = {}
 
 
 def is_exit(obj):
-    return inherits_from(obj, Exit)
\ No newline at end of file
+    return is_typeclass(obj, EXIT)
+
+
+def is_room(obj):
+    return is_typeclass(obj, ROOM)
+
+
+def is_character(obj):
+    return is_typeclass(obj, CHARACTER)
+
+
+def is_construct(obj):
+    return is_typeclass(obj, CONSTRUCT)
+
+
+def is_component(obj):
+    return is_typeclass(obj, COMPONENT)
+
+
+def is_player(obj):
+    return is_typeclass(obj, PLAYER)
+
+
+def is_typeclass(obj, typeclass):
+    key = (obj.__class__, typeclass)
+    try:
+        return _inherits_cache[key]
+    except KeyError:
+        result = _inherits_cache[key] = inherits_from(obj, typeclass)
+        return result
+
+
+def get_etype(obj):
+    """
+    Get the name of the first entry in `ETYPES` that `obj` inherits from,
+    or `OTHER`.
+    """
+    cls = obj.__class__
+    try:
+        return _etype_cache[cls]
+    except KeyError:
+        etype = _etype_cache[cls] = next(
+            (name for name, typeclass in ETYPES
+             if is_typeclass(obj, typeclass)), OTHER)
+        return etype
+
+
+def classify(objs):
+    """
+    Sort objects by type in a single pass.
+
+    Args:
+        objs (iterable): Objects to classify, e.g. a `contents` list.
+
+    Returns:
+        classified (dict): Lists of objects keyed by the names in `ETYPES`
+            plus `OTHER`. Every key is present.
+    """
+    classified = dict((name, []) for name, typeclass in ETYPES)
+    classified[OTHER] = []
+    for obj in objs:
+        classified[get_etype(obj)].append(obj)
+    return classified
@@ -0,0 +1,142 @@
+"""
+Deferred imports, and timing of the imports that do happen.
+
+Only the standard library is used here, so that `IMPORT_TIMER` can be
+installed from `server.conf` before Django and Evennia are set up.
+
+"""
+import sys
+import time
+from importlib import import_module
+
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
+
+# Top-level packages of the game directory; imports of anything else are
+# only counted towards the game module that triggered them.
+GAME_PACKAGES = ("commands", "menus", "server", "typeclasses", "utils",
+                 "web", "world")
+
+_objects = {}
+
+
+def import_object(path):
+    """
+    Import `module.attribute` on first use and remember it.
+
+    Args:
+        path (str): Full Python path, e.g. `"commands.construct.CmdSensors"`.
+
+    Returns:
+        obj (any): The attribute.
+    """
+    try:
+        return _objects[path]
+    except KeyError:
+        module_path, name = path.rsplit(".", 1)
+        obj = _objects[path] = getattr(import_module(module_path), name)
+        return obj
+
+
+class LazyObject(object):
+    """
+    Stands in for a module attribute that is imported the first time it is
+    called or any attribute is read from it.
+
+    Args:
+        path (str): Full Python path of the attribute.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+    def __call__(self, *args, **kwargs):
+        return import_object(self._path)(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(import_object(self._path), name)
+
+    def __repr__(self):
+        return "<LazyObject {0}>".format(self._path)
+
+
+class ImportTimer(object):
+    """
+    Times the first import of every game directory module.
+
+    Records both the cumulative time of each import and its self time,
+    which excludes other game modules imported by it.
+
+    Hooking `__import__` slows every import statement a little, so this
+    is off unless `settings.IMPORT_PROFILE` is set, in which case
+    `at_server_start` installs it and imports from then on (those
+    deferred to first use) are timed. To also time the game's own
+    startup imports, call `IMPORT_TIMER.install()` at the top of the
+    settings file instead.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._stack = []
+        self._original_import = None
+
+    @property
+    def installed(self):
+        return self._original_import is not None
+
+    def install(self):
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def get_slowest(self, count=10):
+        """
+        Returns:
+            slowest (list): Up to `count` `(module, cumulative, self)`
+                tuples, slowest self time first.
+        """
+        rows = [(name, timing[0], timing[1])
+                for name, timing in self.timings.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:count]
+
+    def _import(self, name, globals=None, locals=None, fromlist=(),
+                *args, **kwargs):
+        if name.split(".", 1)[0] not in GAME_PACKAGES:
+            return self._original_import(name, globals, locals, fromlist,
+                                         *args, **kwargs)
+
+        # "from utils import locks" can load utils.locks even though
+        # utils itself is already imported.
+        module = sys.modules.get(name)
+        if module:
+            key = ", ".join("{0}.{1}".format(name, item)
+                            for item in fromlist or ()
+                            if item != "*" and not hasattr(module, item))
+        else:
+            key = name
+        if not key:
+            return self._original_import(name, globals, locals, fromlist,
+                                         *args, **kwargs)
+
+        self._stack.append(0.0)
+        start = time.time()
+        try:
+            return self._original_import(name, globals, locals, fromlist,
+                                         *args, **kwargs)
+        finally:
+            elapsed = time.time() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.timings[key] = (elapsed, elapsed - children)
+
+
+IMPORT_TIMER = ImportTimer()
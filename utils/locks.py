@@ -0,0 +1,194 @@
+from django.conf import settings
+
+from evennia.locks.lockhandler import LockHandler
+from evennia.typeclasses.attributes import AttributeHandler
+from evennia.typeclasses.tags import PermissionHandler
+from evennia.utils.utils import make_iter
+
+from utils.is_etype import is_typeclass
+
+DEFAULT_OBJECT = "evennia.objects.objects.DefaultObject"
+
+PERMISSION_HIERARCHY = tuple(perm.lower()
+                             for perm in settings.PERMISSION_HIERARCHY)
+_HIERARCHY_LEVELS = dict((perm, level)
+                         for level, perm in enumerate(PERMISSION_HIERARCHY))
+
+# Lock definitions ("cmd:all()") mapped to their compiled checks, and
+# (object, player) mapped to what their permissions grant. Both are
+# bounded by clearing when full; the grants are also dropped whenever any
+# permission or quell state changes.
+_CACHE_SIZE = 10000
+_compiled = {}
+_grants = {}
+_original_check = None
+_BYPASS_PROBE = object()
+_QUELL = "_quell"
+
+
+def install():
+    """
+    Make every `LockHandler.check` evaluate compiled lock definitions,
+    and start caching permission grants.
+
+    Changes to permissions and to the quell Attribute are watched from
+    here on, so grants are only cached once this has run. Safe to call
+    more than once.
+    """
+    global _original_check
+    if _original_check is None:
+        _original_check = LockHandler.check
+        LockHandler.check = check
+        for handler, names, key_arg in (
+                (PermissionHandler, ("add", "remove", "clear"), None),
+                (AttributeHandler, ("add", "remove", "clear"), 0)):
+            for name in names:
+                _watch(handler, name, key_arg)
+
+
+def _watch(handler, name, key_arg):
+    # Wrap a handler method so that calling it drops the cached grants;
+    # for Attributes, only if the quell Attribute is affected.
+    original = getattr(handler, name)
+
+    def wrapper(self, *args, **kwargs):
+        if key_arg is None or not args or \
+                _QUELL in make_iter(args[key_arg]):
+            _grants.clear()
+        return original(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = original.__doc__
+    setattr(handler, name, wrapper)
+
+
+def clear():
+    _compiled.clear()
+    _grants.clear()
+
+
+def check(self, accessing_obj, access_type, default=False,
+          no_superuser_bypass=False):
+    """
+    Replacement for `LockHandler.check`.
+
+    Behaves like Evennia's, but evaluates the lock with a closure compiled
+    once per distinct lock definition instead of calling every lock
+    function and `eval`-ing the combined result on each check.
+    """
+    # Evennia's check decides the superuser bypass; asked about a lock
+    # that cannot exist, it returns True only if the lock is bypassed.
+    if not no_superuser_bypass and _original_check(
+            self, accessing_obj, _BYPASS_PROBE, default=False):
+        return True
+
+    lock = self.locks.get(access_type)
+    if lock is None:
+        return default
+
+    evalstring, lock_funcs, raw_lockstring = lock
+    compiled = _compiled.get(raw_lockstring)
+    if compiled is None:
+        if len(_compiled) >= _CACHE_SIZE:
+            _compiled.clear()
+        compiled = _compiled[raw_lockstring] = compile_lock(evalstring,
+                                                            lock_funcs)
+    return compiled(accessing_obj, self.obj)
+
+
+def compile_lock(evalstring, lock_funcs):
+    """
+    Turn a parsed lock definition into a function.
+
+    Args:
+        evalstring (str): The definition with each lock function replaced
+            by `%s`, e.g. `"%s or not %s"`, as parsed by `LockHandler`.
+        lock_funcs (tuple): `(func, args, kwargs)` for each `%s`.
+
+    Returns:
+        check (callable): `check(accessing_obj, accessed_obj)`, returning
+            whether access is granted.
+    """
+    namespace = {}
+    calls = []
+    for num, (func, args, kwargs) in enumerate(lock_funcs):
+        namespace["_func{0}".format(num)] = func
+        namespace["_args{0}".format(num)] = tuple(args)
+        namespace["_kwargs{0}".format(num)] = kwargs
+        calls.append("bool(_func{0}(accessing_obj, accessed_obj, *_args{0}, "
+                     "**_kwargs{0}))".format(num))
+    return eval("lambda accessing_obj, accessed_obj: " +
+                (evalstring % tuple(calls) or "False"), namespace)
+
+
+def get_permission_grants(obj):
+    """
+    Get what the permissions of `obj` add up to, as the `perm` lock
+    functions see them.
+
+    Once `install` has run, the result is cached per object and puppeting
+    player until any permission or quell state changes, so checks do not
+    read the permissions again.
+
+    Returns:
+        grants (tuple): `(level, permissions, direct)`: the highest
+            position in `PERMISSION_HIERARCHY` that `obj` passes (-1 for
+            none), every lowercased permission `obj` is granted, and
+            whether holding a permission passes even `perm_above` for it
+            (true for anything but a puppet).
+    """
+    player = obj.player if is_typeclass(obj, DEFAULT_OBJECT) else None
+    key = (id(obj), id(player))
+    entry = _grants.get(key)
+    if entry and entry[0] is obj and entry[1] is player:
+        return entry[2]
+
+    perms = tuple(perm.lower() for perm in obj.permissions.all())
+    level = _get_level(perms)
+    if player:
+        perms_player = tuple(perm.lower()
+                             for perm in player.permissions.all())
+        if player.attributes.get(_QUELL):
+            # Quelling caps the player's level at the puppet's own and
+            # hides the player's other permissions.
+            level = min(level, _get_level(perms_player))
+        else:
+            level = _get_level(perms_player)
+            perms += perms_player
+    grants = (level, frozenset(perms), not player)
+
+    if _original_check is not None:
+        if len(_grants) >= _CACHE_SIZE:
+            _grants.clear()
+        _grants[key] = (obj, player, grants)
+    return grants
+
+
+def has_permission(obj, permission, above=False):
+    """
+    Check a permission the way the `perm` and `perm_above` lock functions
+    do, using `get_permission_grants`.
+    """
+    level, perms, direct = get_permission_grants(obj)
+    permission = permission.lower()
+    if direct and permission in perms:
+        return True
+    required = _HIERARCHY_LEVELS.get(permission)
+    if required is None:
+        return permission in perms
+    return required < level if above else required <= level
+
+
+def to_player(obj):
+    """
+    Get the player of a puppet, as the `pperm` lock functions check it.
+    Anything that is not an object is returned as is.
+    """
+    if is_typeclass(obj, DEFAULT_OBJECT):
+        return obj.player
+    return obj
+
+
+def _get_level(perms):
+    return max([_HIERARCHY_LEVELS.get(perm, -1) for perm in perms] or [-1])
+
@@ -1,8 +1,82 @@
+from itertools import islice
+
+from utils.lazy import LazyObject
+
+PAGE_SIZE = 10
+
+# Imported when the first menu opens rather than with the modules that
+# can open one.
+EvMenu = LazyObject("evennia.utils.evmenu.EvMenu")
+
+
+def option_template(func):
+    """
+    Decorator memoizing an option builder on its arguments.
+
+    The options returned are built once per distinct set of arguments and
+    then shared by every session, so they must be treated as immutable.
+    Arguments must be hashable and static (node names, strings, module
+    level functions); per-session data should be read from the caller
+    inside the exec callables instead of being bound into the options.
+    """
+    cache = {}
+
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        try:
+            return cache[key]
+        except KeyError:
+            options = cache[key] = func(*args, **kwargs)
+            return options
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def cached_node(get_version):
+    """
+    Decorator caching the `(text, options)` a node function returns, per
+    caller.
+
+    The cache lives on `caller.ndb` so it outlives a single menu, and is
+    keyed on the node name; it is reused for as long as
+    `get_version(caller)` returns the same value. Only wrap the rendering
+    part of a node; side effects such as formatter changes must stay
+    outside it.
+
+    Args:
+        get_version (callable): Called with the caller, returns a hashable
+            value that changes whenever the node output would.
+    """
+    def decorator(func):
+        name = func.__name__
+
+        def wrapper(caller):
+            version = get_version(caller)
+            cache = caller.ndb._rendered_nodes
+            if cache is None:
+                cache = caller.ndb._rendered_nodes = {}
+
+            entry = cache.get(name)
+            if entry is None or entry[0] != version:
+                entry = cache[name] = (version, func(caller))
+            return entry[1]
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    return decorator
+
+
 def wrap_exec(caller, func_call, **kwargs):
     return lambda caller: func_call(caller, **kwargs)
 
+
+@option_template
 def get_user_input(blank_goto, default_goto, blank_exec=None,
-                          default_exec=None):
+                   default_exec=None):
     options = ({
                    "key": "",
                    "goto": blank_goto,
@@ -16,6 +90,7 @@ def get_user_input(blank_goto, default_goto, blank_exec=None,
     return options
 
 
+@option_template
 def get_user_yesno(yes_goto, no_goto, yes_exec=None, no_exec=None):
     options = ({
                    "key": ('y', 'yes',),
@@ -30,31 +105,152 @@ def get_user_yesno(yes_goto, no_goto, yes_exec=None, no_exec=None):
     return options
 
 
-def reset_node_formatter(caller, new_formatter=None):
-    if not hasattr(caller.ndb._menutree, "_backup_node_formatter"):
-        caller.ndb._menutree._backup_node_formatter = None
+def get_paged_options(caller, pager, items, get_desc, item_goto, on_select,
+                      goto, back_goto, get_name=lambda item: item.key,
+                      page_size=PAGE_SIZE):
+    """
+    Build the options for one page of a long list.
+
+    Only the visible page of `items` is turned into options, so the cost
+    of a render does not grow with the length of the list. Any input that
+    does not match an option is used as a name-prefix filter (blank input
+    clears it). Item options share one exec callable that looks the
+    chosen item up on the menu, and the navigation options are templates,
+    so no closures are created per render.
+
+    Args:
+        caller (Object or Session): The menu caller.
+        pager (str): Name to store the page and filter under on the menu.
+        items (iterable): All items in the list.
+        get_desc (callable): Returns the option text for an item.
+        item_goto (str): The node to go to after an item is chosen.
+        on_select (callable): Called with `(caller, item)` when an item is
+            chosen.
+        goto (str): The node rendering this list.
+        back_goto (str): The node the "Back" option leads to.
+        get_name (callable, optional): Returns the name of an item to
+            filter on.
+        page_size (int, optional): Number of items per page.
 
-    restore_node_formatter(caller)
-    backup_node_formatter(caller)
-    if new_formatter:
-        set_node_formatter(caller, new_formatter)
+    Returns:
+        page_text (str): Page number and active filter, for the node text.
+        options (tuple): The menu options.
+    """
+    page, prefix = _get_pager_state(caller, pager)
 
+    if prefix:
+        items = (item for item in items
+                 if get_name(item).lower().startswith(prefix))
 
-def backup_node_formatter(caller):
-    caller.ndb._menutree._backup_node_formatter = get_node_formatter(
-        caller)
+    start = page * page_size
+    visible = list(islice(items, start, start + page_size + 1))
+    has_next = len(visible) > page_size
+    del visible[page_size:]
 
+    caller.ndb._menutree._active_page = (pager, page, prefix, visible,
+                                         on_select)
 
-def restore_node_formatter(caller):
-    backup_node_formatter = caller.ndb._menutree._backup_node_formatter
-    if backup_node_formatter:
-        set_node_formatter(caller,
-                           caller.ndb._menutree._backup_node_formatter)
-        caller.ndb._menutree._backup_node_formatter = None
+    options = [{
+                   "desc": get_desc(item),
+                   "goto": item_goto,
+                   "exec": _exec_select_page_item,
+               } for item in visible]
+    if has_next:
+        options.extend(_get_option_next_page(goto))
+    if page:
+        options.extend(_get_option_prev_page(goto))
+    options.extend(_get_option_page_back(goto, back_goto))
 
+    page_text = "Page {0}".format(page + 1)
+    if prefix:
+        page_text += " (filter: {0}*)".format(prefix)
+    return page_text, tuple(options)
 
-def set_node_formatter(caller, formatter):
-    caller.ndb._menutree._node_formatter = formatter
+
+@option_template
+def _get_option_next_page(goto):
+    return ({
+                "key": ("n", "next"),
+                "desc": "Next page",
+                "goto": goto,
+                "exec": _exec_next_page,
+            },)
+
+
+@option_template
+def _get_option_prev_page(goto):
+    return ({
+                "key": ("p", "prev"),
+                "desc": "Previous page",
+                "goto": goto,
+                "exec": _exec_prev_page,
+            },)
+
+
+@option_template
+def _get_option_page_back(goto, back_goto):
+    return ({
+                "desc": "Back",
+                "goto": back_goto,
+                "exec": _exec_reset_page,
+            },
+            {
+                "key": "_default",
+                "goto": goto,
+                "exec": _exec_filter_page,
+            },)
+
+
+def _exec_select_page_item(caller, raw_string):
+    pager, page, prefix, visible, on_select = \
+        caller.ndb._menutree._active_page
+    on_select(caller, visible[int(raw_string.strip()) - 1])
+    _set_pager_state(caller, pager, 0, "")
+
+
+def _exec_next_page(caller):
+    pager, page, prefix = caller.ndb._menutree._active_page[:3]
+    _set_pager_state(caller, pager, page + 1, prefix)
+
+
+def _exec_prev_page(caller):
+    pager, page, prefix = caller.ndb._menutree._active_page[:3]
+    _set_pager_state(caller, pager, page - 1, prefix)
+
+
+def _exec_reset_page(caller):
+    _set_pager_state(caller, caller.ndb._menutree._active_page[0], 0, "")
+
+
+def _exec_filter_page(caller, raw_string):
+    _set_pager_state(caller, caller.ndb._menutree._active_page[0], 0,
+                     raw_string.strip().lower())
+
+
+def _get_pager_state(caller, pager):
+    menutree = caller.ndb._menutree
+    if not hasattr(menutree, "_pagers"):
+        menutree._pagers = {}
+    return menutree._pagers.get(pager, (0, ""))
+
+
+def _set_pager_state(caller, pager, page, prefix):
+    _get_pager_state(caller, pager)
+    caller.ndb._menutree._pagers[pager] = (page, prefix)
+
+
+def reset_node_formatter(caller, new_formatter=None):
+    """
+    Drop back to the formatter the menu was created with, then switch to
+    `new_formatter` if given.
+    """
+    menutree = caller.ndb._menutree
+    try:
+        original = menutree._original_node_formatter
+    except AttributeError:
+        original = menutree._original_node_formatter = \
+            menutree._node_formatter
+    menutree._node_formatter = new_formatter or original
 
 
 def get_node_formatter(caller):
@@ -0,0 +1,199 @@
+from copy import deepcopy
+from importlib import import_module
+
+from django.db import transaction
+
+from evennia.utils.spawner import spawn
+from evennia.utils.utils import class_from_module, make_iter
+
+try:
+    from importlib import reload
+except ImportError:
+    from imp import reload
+
+try:
+    _STRING_TYPES = basestring
+except NameError:
+    _STRING_TYPES = str
+
+PROTOTYPE_MODULE = "world.prototypes"
+
+# Keys with a special meaning to the spawner; every other key becomes an
+# Attribute (or an NAttribute, for ndb_ keys).
+_SPECIAL_KEYS = {
+    "key": _STRING_TYPES,
+    "typeclass": _STRING_TYPES,
+    "location": None,
+    "home": None,
+    "destination": None,
+    "permissions": (_STRING_TYPES, list, tuple),
+    "locks": _STRING_TYPES,
+    "aliases": (_STRING_TYPES, list, tuple),
+    "tags": (list, tuple),
+    "exec": (_STRING_TYPES, list, tuple),
+}
+
+
+class PrototypeRegistry(object):
+    """
+    Prototypes from a module, with inheritance flattened once.
+
+    Each prototype's `prototype` parent chain is merged into a plain dict,
+    its keys and typeclass are checked, and the result is cached, so
+    spawning does not walk the chain again. `reload` re-imports the module
+    and only re-resolves prototypes whose own source, or whose ancestors'
+    source, changed.
+
+    Args:
+        module_path (str): Python path to the prototype module.
+    """
+
+    def __init__(self, module_path=PROTOTYPE_MODULE):
+        self.module_path = module_path
+        self._module = None
+        self._sources = {}
+        self._fingerprints = {}
+        self._resolved = {}
+        self._typeclasses = {}
+
+    def get(self, name):
+        """
+        Get the flattened prototype `name`.
+
+        Raises:
+            KeyError: If there is no such prototype.
+            ValueError: If the prototype is invalid.
+        """
+        self._load()
+        try:
+            return self._resolved[name]
+        except KeyError:
+            prototype = self._resolved[name] = self._resolve(name, ())
+            return prototype
+
+    def names(self):
+        self._load()
+        return sorted(self._sources)
+
+    def spawn(self, name, **overrides):
+        return self.spawn_many(name, 1, **overrides)[0]
+
+    def spawn_many(self, name, count, **overrides):
+        """
+        Spawn `count` objects from prototype `name` in one transaction.
+
+        Args:
+            name (str): The prototype.
+            count (int): How many objects to spawn.
+            **overrides: Prototype keys to set on all of them, such as
+                `location`.
+
+        Returns:
+            objs (list): The new objects.
+        """
+        prototype = dict(self.get(name), **overrides)
+        with transaction.atomic():
+            return spawn(*[dict(prototype) for _ in range(count)])
+
+    def reload(self):
+        """
+        Re-import the prototype module and drop the cached prototypes that
+        changed.
+
+        Returns:
+            changed (list): Names of prototypes that were added, changed
+                or removed.
+        """
+        if self._module is None:
+            self._load()
+            return self.names()
+
+        old_fingerprints = self._fingerprints
+        self._module = reload(self._module)
+        self._read_module()
+
+        changed = set(name for name in set(old_fingerprints) |
+                      set(self._fingerprints)
+                      if old_fingerprints.get(name) !=
+                      self._fingerprints.get(name))
+        for name in list(self._resolved):
+            if changed.intersection(self._get_lineage(name)):
+                del self._resolved[name]
+        return sorted(changed)
+
+    def get_typeclass(self, path):
+        try:
+            return self._typeclasses[path]
+        except KeyError:
+            typeclass = self._typeclasses[path] = class_from_module(path)
+            return typeclass
+
+    def _load(self):
+        if self._module is None:
+            self._module = import_module(self.module_path)
+            self._read_module()
+
+    def _read_module(self):
+        self._sources = dict(
+            (name, value) for name, value in vars(self._module).items()
+            if isinstance(value, dict) and not name.startswith("_"))
+        self._fingerprints = dict(
+            (name, _fingerprint(value))
+            for name, value in self._sources.items())
+
+    def _get_lineage(self, name, seen=()):
+        lineage = set([name])
+        source = self._sources.get(name)
+        if source and name not in seen:
+            for parent in make_iter(source.get("prototype", ())):
+                lineage |= self._get_lineage(parent, seen + (name,))
+        return lineage
+
+    def _resolve(self, name, seen):
+        if name in seen:
+            raise ValueError("Prototype {0} inherits from itself.".format(
+                name))
+        if name not in self._sources:
+            raise KeyError("No prototype named {0}.".format(name))
+
+        prototype = deepcopy(self._sources[name])
+        resolved = {}
+        for parent in make_iter(prototype.pop("prototype", ())):
+            resolved.update(self._resolved.get(parent) or
+                            self._resolve(parent, seen + (name,)))
+        resolved.update(prototype)
+        self._validate(name, resolved)
+        return resolved
+
+    def _validate(self, name, prototype):
+        for key, types in _SPECIAL_KEYS.items():
+            if types and key in prototype and \
+                    not callable(prototype[key]) and \
+                    not isinstance(prototype[key], types):
+                raise ValueError("Prototype {0} has an invalid {1}.".format(
+                    name, key))
+
+        if "typeclass" in prototype:
+            try:
+                self.get_typeclass(prototype["typeclass"])
+            except ImportError:
+                raise ValueError(
+                    "Prototype {0} has an unknown typeclass {1}.".format(
+                        name, prototype["typeclass"]))
+
+
+def _fingerprint(value):
+    # Functions are compared by their code, not their identity, so a
+    # module reload does not mark every prototype with a lambda as changed.
+    if isinstance(value, dict):
+        return tuple(sorted((key, _fingerprint(item))
+                            for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(item) for item in value)
+    code = getattr(value, "__code__", value)
+    if hasattr(code, "co_code"):
+        return code.co_code, _fingerprint(code.co_consts)
+    return repr(value)
+
+
+PROTOTYPES = PrototypeRegistry()
@@ -0,0 +1,134 @@
+import re
+import time
+from bisect import bisect_left
+
+from evennia.objects.models import ObjectDB
+
+MULTIMATCH_SEPARATOR = "-"
+_RE_MULTIMATCH = re.compile(r"^(\d+)" + MULTIMATCH_SEPARATOR + r"(.+)$")
+
+# Seconds before the admin-wide key index is rebuilt from the database.
+GLOBAL_INDEX_TTL = 60
+
+
+def split_multimatch(query):
+    """
+    Split `2-ball` style input.
+
+    Returns:
+        split (tuple): `(index, query)` with a zero-based index, or
+            `(None, query)` if there is no index.
+    """
+    match = _RE_MULTIMATCH.match(query)
+    if match:
+        return int(match.group(1)) - 1, match.group(2)
+    return None, query
+
+
+class LocationIndex(object):
+    """
+    Per-location map from lowercased keys and aliases to the objects in
+    that location, and a sorted list of the words in their keys for
+    prefix lookups.
+
+    An index is built the first time a location is searched and reused
+    until the location is invalidated (objects moving in or out do this)
+    or its number of contents changes. Hits are checked against the
+    object's current location and names, so a stale entry can give fewer
+    matches but never a wrong one.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+
+    def invalidate(self, location):
+        if location:
+            self._indexes.pop(location.id, None)
+
+    def search(self, location, name):
+        """
+        Get the objects in `location` with `name` as key or alias.
+        """
+        name = name.lower()
+        return [obj for obj in self._get_entry(location)[1].get(name, ())
+                if obj.location == location and name in get_names(obj)]
+
+    def search_prefix(self, location, prefix):
+        """
+        Get the objects in `location` with a key word starting with
+        `prefix`. Every object Evennia's non-exact search could match by
+        key for a query starting with `prefix` is among them.
+        """
+        words, objs = self._get_entry(location)[2:]
+        prefix = prefix.lower()
+        matches = []
+        for num in range(bisect_left(words, prefix), len(words)):
+            if not words[num].startswith(prefix):
+                break
+            if objs[num].location == location:
+                matches.append(objs[num])
+        return matches
+
+    def _get_entry(self, location):
+        contents = location.contents
+        entry = self._indexes.get(location.id)
+        if entry is None or entry[0] != len(contents):
+            entry = self._indexes[location.id] = \
+                (len(contents), _build(contents)) + _build_words(contents)
+        return entry
+
+
+class GlobalKeyIndex(object):
+    """
+    Map from lowercased keys and aliases to object ids across the whole
+    database, for admin-wide searches. Rebuilt from two queries every
+    `GLOBAL_INDEX_TTL` seconds.
+    """
+
+    def __init__(self):
+        self._ids = None
+        self._built = 0
+
+    def search(self, name):
+        if self._ids is None or time.time() - self._built > GLOBAL_INDEX_TTL:
+            self._ids = {}
+            for obj_id, key in ObjectDB.objects.values_list("id", "db_key"):
+                self._ids.setdefault(key.lower(), []).append(obj_id)
+            for obj_id, alias in ObjectDB.objects.filter(
+                    db_tags__db_tagtype="alias").values_list(
+                    "id", "db_tags__db_key"):
+                self._ids.setdefault(alias.lower(), []).append(obj_id)
+            self._built = time.time()
+
+        name = name.lower()
+        ids = self._ids.get(name)
+        if not ids:
+            return []
+        return [obj for obj in ObjectDB.objects.filter(id__in=ids)
+                if name in get_names(obj)]
+
+
+def get_names(obj):
+    """
+    Get the lowercased key and aliases `obj` can be searched by.
+    """
+    return [obj.key.lower()] + [alias.lower() for alias in obj.aliases.all()]
+
+
+def _build(contents):
+    index = {}
+    for obj in contents:
+        for name in get_names(obj):
+            index.setdefault(name, []).append(obj)
+    return index
+
+
+def _build_words(contents):
+    pairs = sorted((word, num) for num, obj in enumerate(contents)
+                   for word in set(obj.key.lower().split()))
+    return ([word for word, _ in pairs],
+            [contents[num] for _, num in pairs])
+
+
+LOCATION_INDEX = LocationIndex()
+GLOBAL_KEY_INDEX = GlobalKeyIndex()
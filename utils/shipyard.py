@@ -0,0 +1,42 @@
+from django.db import transaction
+
+from utils.is_etype import is_construct
+from utils.prototypes import PROTOTYPES
+
+DEFAULT_SHIP_PROTOTYPE = "SHUTTLE"
+
+# (attribute, value, description) of the modifications the dock offers.
+SHIP_MODIFICATIONS = (
+    ("engine", "fusion", "Fit a fusion engine"),
+    ("shields", "deflector", "Fit deflector shields"),
+)
+
+
+def purchase_ship(buyer, dock, prototype=DEFAULT_SHIP_PROTOTYPE):
+    """
+    Spawn a new ship owned by `buyer` at `dock`.
+
+    The object, its Attributes and its ownership are created in one
+    transaction, so a failed purchase leaves nothing behind.
+    """
+    with transaction.atomic():
+        ship = PROTOTYPES.spawn(prototype, location=dock, home=dock)
+        ship.db.owner = buyer
+        ship.locks.add("control:id({0}) or perm(Immortals)".format(buyer.id))
+    return ship
+
+
+def get_docked_ships(owner, dock):
+    return [obj for obj in dock.contents
+            if is_construct(obj) and obj.db.owner == owner]
+
+
+def modify_ship(ship, attribute, value):
+    return ship.update_attributes({attribute: value})
+
+
+def repair_ship(ship):
+    # Read max_hull at commit time so a repair never writes back a stale
+    # value read when the menu was drawn.
+    return ship.update_attributes({"hull": ship.db.max_hull})
+
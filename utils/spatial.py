@@ -0,0 +1,103 @@
+from collections import defaultdict
+from math import isinf, isnan, sqrt
+
+from django.conf import settings
+
+
+class SpatialIndex(object):
+    """
+    Uniform grid over 3D coordinates.
+
+    Objects are bucketed into cubic cells (sectors) of side `cell_size`,
+    so range queries only look at the cells around the query point, or at
+    the occupied cells when there are fewer of those, instead of every
+    object.
+
+    Args:
+        cell_size (float): Side of a sector.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self._cells = defaultdict(dict)
+        self._positions = {}
+
+    def clear(self):
+        self._cells.clear()
+        self._positions.clear()
+
+    def update(self, obj, position):
+        """
+        Add `obj` at `position`, or move it there if already indexed.
+        """
+        self.remove(obj)
+        position = tuple(float(coord) for coord in position)
+        sector = self.get_sector(position)
+        self._positions[obj.id] = (position, obj)
+        self._cells[sector][obj.id] = obj
+
+    def remove(self, obj):
+        entry = self._positions.pop(obj.id, None)
+        if entry:
+            sector = self.get_sector(entry[0])
+            cell = self._cells[sector]
+            cell.pop(obj.id, None)
+            if not cell:
+                del self._cells[sector]
+
+    def get_position(self, obj):
+        entry = self._positions.get(obj.id)
+        return entry[0] if entry else None
+
+    def get_sector(self, position):
+        return tuple(int(coord // self.cell_size) for coord in position)
+
+    def in_sector(self, sector):
+        return list(self._cells.get(tuple(sector), {}).values())
+
+    def in_range(self, position, radius):
+        """
+        Get the objects within `radius` of `position`.
+
+        Returns:
+            matches (list): `(distance, obj)` tuples, nearest first.
+
+        Raises:
+            ValueError: If `radius` is infinite or not a number.
+        """
+        if isinf(radius) or isnan(radius):
+            raise ValueError("Range must be a finite number.")
+        reach = int(radius // self.cell_size) + 1
+        matches = [(distance, obj)
+                   for distance, obj in self._scan(position, reach)
+                   if distance <= radius]
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def _scan(self, position, reach):
+        center = self.get_sector(position)
+        cells = self._cells
+        if (2 * reach + 1) ** 3 > len(cells):
+            # Fewer occupied cells than cells in the cube: check those.
+            sectors = [sector for sector in cells
+                       if max(abs(a - b) for a, b in zip(sector, center)) <=
+                       reach]
+        else:
+            sectors = [(center[0] + dx, center[1] + dy, center[2] + dz)
+                       for dx in range(-reach, reach + 1)
+                       for dy in range(-reach, reach + 1)
+                       for dz in range(-reach, reach + 1)]
+        for sector in sectors:
+            cell = cells.get(sector)
+            if not cell:
+                continue
+            for obj_id, obj in cell.items():
+                yield _distance(position, self._positions[obj_id][0]), obj
+
+
+def _distance(a, b):
+    return sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+CONSTRUCT_INDEX = SpatialIndex(getattr(settings, "CONSTRUCT_SECTOR_SIZE",
+                                       1000))
@@ -71,3 +71,18 @@ See the `@spawn` command and `evennia.utils.spawner` for more info.
 # "key": "goblin archwizard",
 # "prototype" : ("GOBLIN_WIZARD", "ARCHWIZARD_MIXIN")
 #}
+
+SHIP = {
+    "typeclass": "typeclasses.constructs.Construct",
+    "hull": 100,
+    "max_hull": 100,
+    "engine": "ion",
+    "shields": "none",
+}
+
+SHUTTLE = {
+    "prototype": "SHIP",
+    "key": "shuttle",
+    "desc": "A small short-range shuttle, fresh from the Origins "
+            "Foundation Dock.",
+}